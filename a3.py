@@ -14,372 +14,219 @@ import useful packages
 """
 import tkinter as tk
 import random
+from array import array
 from tkinter import messagebox
 import time
-import linecache
+import hashlib
+import io
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
 from tkinter import filedialog
-from PIL import ImageTk, Image
-
-
-"""
-define some useful variables
-"""
-UP = "up"
-DOWN = "down"
-LEFT = "left"
-RIGHT = "right"
-DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
-              f"{UP}-{LEFT}", f"{UP}-{RIGHT}",
-              f"{DOWN}-{LEFT}", f"{DOWN}-{RIGHT}")
-POKEMON = "☺"
-FLAG = "♥"
-UNEXPOSED = "~"
-
-
-class BoardModel(object):
+from pokemon_engine import (BoardModel, POKEMON, FLAG, UNEXPOSED, UNEXPOSED_CODE, FLAG_CODE, POKEMON_CODE,
+                            CELL_CHARACTERS, MIN_GRID_SIZE, MAX_GRID_SIZE)
+from pokemon_engine.atomic import write_atomic
+from pokemon_engine.noguess import NoGuessSearch, SeedCache, TIMEOUT as NO_GUESS_TIMEOUT
+from pokemon_engine.savegame import save_board, load_board, SAVE_EXTENSION
+
+SEED_CACHE_FILE = 'no_guess_seeds.json'  # the no-guess boards found but not played yet
+SEARCH_POLL = 50  # milliseconds between two looks at a running no-guess search
+LOGGER = logging.getLogger('a3')  # the timings of the game, shown with logging.basicConfig(level=logging.INFO)
+SAVE_FILE_TYPES = [('Pokemon games', '*' + SAVE_EXTENSION)]
+
+CELL_COLOURS = {UNEXPOSED: 'dark green', FLAG: 'red', POKEMON: 'yellow'}  # the numbers are 'light green'
+FRAME_BUDGET = 16  # milliseconds between two drawings of the mouse position (about 60 frames a second)
+MIN_CELL_SIZE = 16  # pixels, the cells of bigger boards stay this size and the board scrolls
+VIEW_MARGIN = 2  # cells drawn past each edge of the viewport, so that a small scroll shows drawn cells
+WHEEL_CELLS = 3  # cells scrolled by a step of the mouse wheel
+CELL_CODES = {character: code for code, character in enumerate(CELL_CHARACTERS)}  # the state code of a character
+BOARD_CODES = str.maketrans({character: chr(code) for character, code in CELL_CODES.items()})  # game string -> codes
+DIFF_CHUNK = 4096  # cells compared at a time when a whole board is drawn
+
+# the zoom levels are cell sizes in pixels: the sprite or cell levels, then colour blocks down to a quarter pixel
+SPRITE_LEVELS = (64, 32, 16)  # the mip levels every sprite is scaled to once, the board fitting the view is one more
+BLOCK_LEVELS = (8, 4, 2, 1, 0.5, 0.25)  # the board is one image with a block of colour for each cell
+BLOCK_COLOURS = {UNEXPOSED: (0, 100, 0), FLAG: (255, 0, 0), POKEMON: (255, 255, 0)}  # as CELL_COLOURS
+NUMBER_BLOCK_COLOUR = (144, 238, 144)  # 'light green'
+# one translate table for each of the red, green and blue bytes of the blocks, from the state codes
+BLOCK_CHANNELS = tuple(bytes(BLOCK_COLOURS.get(character, NUMBER_BLOCK_COLOUR)[channel]
+                             for character in CELL_CHARACTERS).ljust(256, b'\0') for channel in range(3))
+
+SPRITE_CACHE_SIZE = 256  # scaled images kept for all the views, about 14 board sizes of every sprite
+UNREVEALED_IMAGE = 'images/unrevealed.gif'  # the unrevealed glass
+UNREVEALED_MOVED_IMAGE = 'images/unrevealed_moved.gif'  # the unrevealed glass when mouse in it
+POKEBALL_IMAGE = 'images/pokeball.gif'  # the pokeball when right click the cell
+CLOCK_IMAGE = 'images/clock.gif'
+POKEMON_IMAGES = tuple('images/pokemon_sprites/{0}.gif'.format(name)
+                       for name in ('charizard', 'cyndaquil', 'pikachu', 'psyduck', 'togepi', 'umbreon'))
+NUMBER_IMAGES = tuple('images/{0}_adjacent.gif'.format(number)  # the image of each number, 0 to 8
+                      for number in ('zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight'))
+BOARD_IMAGES = (UNREVEALED_IMAGE, UNREVEALED_MOVED_IMAGE, POKEBALL_IMAGE) + POKEMON_IMAGES + NUMBER_IMAGES
+SPRITE_CACHE_DIR = 'sprite_cache'  # the scaled images saved for the next launches
+COMMON_GRID_SIZES = (5, 6, 8, 10, 12, 15, 16, 20, 24, 25, 30)  # the board sizes scaled in the background
+
+
+def sprite_size(board_width, grid_size):
+    """ Return the width and height in pixels of the cell images of a board """
+    return max(int((board_width / grid_size) / 2) * 2, MIN_CELL_SIZE)
+
+
+class SpriteCache(object):
     """
-    This part will be used to store and manage the internal game state
-
-    There will have some code from Assignment 1
+    The decoded and scaled images of the game, keyed by (asset, pixel size) and shared by every view and
+    status bar, so that new games, restarts and new board sizes reuse the images already made. The least
+    recently used images are dropped first when there are too many; a view keeps its own references, so an
+    image it still shows is never freed.
+
+    With a directory, every scaled image is also saved there as a PNG named after the hash of its asset and
+    its size, and the next launches load it as it is, without PIL. An edited asset gets a new hash, so a
+    stale file is never used.
     """
 
-    def __init__(self, grid_size, num_pokemon):
-        """
-        Construct the basic model of Pokemon Game
-
-        Args:
-            grid_size: the board size of the game
-            num_pokemon: how many pokemons in this game
-        """
-
-        self._grid_size = grid_size
-        self._num_pokemon = num_pokemon
-        self._game_string = None
-        self._pokemon_locations = None
-        self.get_game()
-        self.get_pokemon_locations()
-
-    def get_game(self):
-        """ Return the game string when input the grid size."""
-        game_string = UNEXPOSED * self._grid_size ** 2
-
-        self._game_string = game_string
-        return self._game_string
-
-    def restart_game(self):
-        """ Reset the game string but no not change the pokemon locations."""
-        return self.get_game()
-
-    def new_game(self):
-        """ Reset the pokemon locations for a new game. """
-        return self.get_pokemon_locations()
-
-    def get_pokemon_locations(self):
-
-        """
-        Pokemons will be generated and given a random index within the game.
-
-        And update the value of self._pokemon_locations
-
-        """
-        cell_count = self._grid_size ** 2
-        pokemon_locations = ()
-
-        for _ in range(self._num_pokemon):
-            if len(pokemon_locations) >= cell_count:
-                break
-            index = random.randint(0, cell_count - 1)
-
-            while index in pokemon_locations:
-                index = random.randint(0, cell_count - 1)
-
-            pokemon_locations += (index,)
-
-        self._pokemon_locations = pokemon_locations
-
-    def get_num_pokemon(self):
-        """ Calculate how many pokemons in this game """
-        return self._num_pokemon
-
-    def check_win(self):
-        """
-        Checking if the player has won the game.
-            Returns:
-                True: if win the game
-                False: if lose the game
-
-        """
-
-        return UNEXPOSED not in self._game_string and self._game_string.count(FLAG) == len(self._pokemon_locations)
-
-    def flag_cell(self, index):
-        """Toggle Flag on or off at selected index. If the selected index is already
-            revealed, the game would return with no changes.
-
-            Parameters:
-                index (int): The index in the game string where a flag is placed.
-            Returns
-                (str): The updated game string.
+    def __init__(self, max_size=SPRITE_CACHE_SIZE, directory=None):
         """
-
-        if self._game_string[index] == FLAG:
-            self._game_string = self.replace_character_at_index(index, UNEXPOSED)
-
-        elif self._game_string[index] == UNEXPOSED:
-            self._game_string = self.replace_character_at_index(index, FLAG)
-
-    def reveal_cells(self, index):
-        """
-        Reveals all neighbouring cells at index and repeats for all
-        cells that had a 0.
-
-        Does not reveal flagged cells or cells with Pokemon.
-
         Parameters:
-            index (int): Index of the currently selected cell
-
-        Returns:
-            (str): The updated game string
+            max_size (int): how many images to keep
+            directory (str): where the scaled images are saved, None to keep them in memory only
         """
-        number = self.number_at_cell(index)
-
-        game = self.replace_character_at_index(index, str(number))
-        clear = self.big_fun_search(index)
-        for i in clear:
-            if game[i] != FLAG:
-                number = self.number_at_cell(i)
-                game = self.replace_character_at_index(i, str(number))
-
-        self._game_string = game
-        return self._game_string
-
-    def replace_character_at_index(self, index, character):
+        self._max_size = max_size
+        self._directory = directory
+        self._sprites = OrderedDict()  # (asset, size) -> image, the least recently used first
+        self._hashes = {}  # asset -> hash of its content
+        self._hits = 0
+        self._misses = 0
+        self._from_disk = 0
+        self._scaled = 0
+
+    def get(self, asset, size=None):
         """
-        A specified index in the game string at the specified index is replaced by
-        a new character.
+        Return the image of an asset, it is only decoded and scaled the first time.
 
         Parameters:
-            index (int): The index in the game string where the character is replaced.
-            character (str): The new character that will be replacing the old character.
+            asset (str): the path of the image file
+            size (int): the width and height in pixels, None for the image as it is
 
         Returns:
-            (str): The updated game string.
-        """
-
-        self._game_string = self._game_string[:index] + character + self._game_string[index + 1:]
-
-        return self._game_string
-
-    def index_in_direction(self, index, direction):
+            (tk.PhotoImage | ImageTk.PhotoImage): the image
         """
-       This function takes in the index to a cell in the game string
-    and returns a new index corresponding to an adjacent cell in the specified direction.
-
-        Return None for invalid directions.
-
-            Paramaters:
-        index (int): the index of the action in the game string
-        grid_size (int): size of game
-        direction (str): specific direction to find the neighbor of the selected
-
-            Returns:
-        neighbor index (int): return the specific direction cell's index
-        """
-
-        if direction == UP:
-            if index < self._grid_size:
-                return
-            return index - self._grid_size
-
-        if direction == DOWN:
-            if index > (self._grid_size ** 2 - self._grid_size) - 1:
-                return
-            return index + self._grid_size
-
-        if direction == LEFT:
-            if index % self._grid_size == 0:
-                return
-            return index - 1
-
-        if direction == RIGHT:
-            if (index + 1) % self._grid_size == 0:
-                return
-            return index + 1
-
-        if direction == f"{UP}-{LEFT}":
-            if index % self._grid_size == 0:
-                return
-            if index < self._grid_size:
-                return
-            return index - self._grid_size - 1
-
-        if direction == f"{UP}-{RIGHT}":
-            if (index + 1) % self._grid_size == 0:
-                return
-            if index < self._grid_size:
-                return
-            return index - self._grid_size + 1
-
-        if direction == f"{DOWN}-{LEFT}":
-            if index >= self._grid_size ** 2 - self._grid_size:
-                return
-            if index % self._grid_size == 0:
-                return
-            return index + self._grid_size - 1
-
-        if direction == f"{DOWN}-{RIGHT}":
-            if index > (self._grid_size ** 2 - self._grid_size) - 1:
-                return
-            if (index + 1) % self._grid_size == 0:
-                return
-            return index + self._grid_size + 1
-
-    def index_to_position(self, index):
-        """ Convert the game string index to the row, column coordinate.
-
-        Parameters:
-            index : the index of the cell in the game string
+        key = (asset, size)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+        self._misses += 1
+        sprite = self._sprites[key] = self._load(asset, size)
+        if len(self._sprites) > self._max_size:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def _load(self, asset, size):
+        """ Read the scaled image from the directory, or decode the asset and scale it to size x size """
+        if size is None:
+            return tk.PhotoImage(file=asset)
+        path = self._disk_path(asset, size)
+        if path is not None and os.path.exists(path):
+            try:
+                image = tk.PhotoImage(file=path)
+                self._from_disk += 1
+                return image
+            except tk.TclError:  # a broken file is made again
+                pass
+        from PIL import ImageTk  # only the image board needs PIL, so it is imported here
+        scaled = self._scale(asset, size)
+        self._scaled += 1
+        if path is not None:
+            self._save(scaled, path)
+        return ImageTk.PhotoImage(scaled)
+
+    def _disk_path(self, asset, size):
+        """ Return the file of the scaled image in the directory, None when there is no directory """
+        if self._directory is None:
+            return None
+        digest = self._hashes.get(asset)
+        if digest is None:
+            with open(asset, 'rb') as asset_file:
+                digest = self._hashes[asset] = hashlib.sha1(asset_file.read()).hexdigest()[:16]
+        return os.path.join(self._directory, "{0}-{1}.png".format(digest, size))
+
+    @staticmethod
+    def _scale(asset, size):
+        """ Return the PIL image of an asset scaled to size x size """
+        from PIL import Image
+        return Image.open(asset).convert('RGBA').resize((size, size), Image.LANCZOS)
+
+    def _save(self, scaled, path):
+        """ Write a scaled image with write_atomic, so that a reader never sees half a file """
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            png = io.BytesIO()
+            scaled.save(png, 'PNG')
+            write_atomic(path, png.getvalue())
+        except OSError:  # the cache is only a speed up, the game goes on without it
+            pass
 
-        Returns:
-            tuple<int, int>: The row, column position of a cell
+    def fill(self, sizes, assets=BOARD_IMAGES):
         """
-        y = index // self._grid_size
-        x = index % self._grid_size
-
-        return x, y
-
-    def position_to_index(self, position):
-        """Convert the row, column coordinate in the grid to the game strings index.
+        Save the scaled images of the sizes which are not in the directory yet, without making any Tk image,
+        so that it can run in another thread.
 
         Parameters:
-            position (tuple<int, int>): The row, column position of a cell.
+            sizes (iterable<int>): the widths and heights in pixels
+            assets (iterable<str>): the paths of the image files
 
         Returns:
-            (int): The index of the cell in the game string.
+            (int): how many images were saved
         """
+        if self._directory is None:
+            return 0
+        saved = 0
+        for size in sizes:
+            for asset in assets:
+                path = self._disk_path(asset, size)
+                if not os.path.exists(path):
+                    self._save(self._scale(asset, size), path)
+                    saved += 1
+        return saved
 
-        x, y = position
-        return y * self._grid_size + x
+    def fill_in_background(self, sizes, assets=BOARD_IMAGES):
+        """ Run fill in a daemon thread, return the thread """
+        thread = threading.Thread(target=self.fill, args=(list(sizes), assets), daemon=True)
+        thread.start()
+        return thread
 
-    def get_num_attempted_catches(self):
-        """
-        Calculate how many pokeballs are used currently
-
-        Returns:
-            (int): number of used pokeballs
-
-        """
-
-        used_pokeballs = 0
-        game_string = self._game_string
-        for cell in game_string:
-            if cell == FLAG:
-                used_pokeballs += 1
-        return used_pokeballs
-
-    def neighbour_directions(self, index):
-        """
-    #   This function returns a list of indexes that have a neighbouring cell.
-
-    #   Paramaters:
-        index (int): the index of the action in the game string.
-        grid_size (int): Size of game.
+    def get_counts(self):
+        """ Return (hits, misses), how many images were reused and how many were made """
+        return self._hits, self._misses
 
-    #   Returns:
-        a list which contains all the indexes of neighbouring cell
+    def get_disk_counts(self):
+        """ Return (loaded, scaled), how many of the images made were read from the directory or scaled """
+        return self._from_disk, self._scaled
 
-        """
+    def clear(self):
+        """ Forget all the images, e.g. before the Tk root they belong to is destroyed """
+        self._sprites.clear()
 
-        neighbour1 = []
 
-        if index > self._grid_size ** 2:
-            return
+SPRITES = SpriteCache(directory=SPRITE_CACHE_DIR)  # the images of the whole game
 
-        for direction in DIRECTIONS:
-            neighbour1.append(self.index_in_direction(index, f"{UP}-{LEFT}"))
-            neighbour1.append(self.index_in_direction(index, UP))
-            neighbour1.append(self.index_in_direction(index, f"{UP}-{RIGHT}"))
-            neighbour1.append(self.index_in_direction(index, LEFT))
-            neighbour1.append(self.index_in_direction(index, RIGHT))
-            neighbour1.append(self.index_in_direction(index, f"{DOWN}-{LEFT}"))
-            neighbour1.append(self.index_in_direction(index, DOWN))
-            neighbour1.append(self.index_in_direction(index, f"{DOWN}-{RIGHT}"))
-            neighbour = [_ for _ in neighbour1 if _ != None]
-            return neighbour
-
-    def number_at_cell(self, index):
-        """Calculates what number should be displayed at that specific index in the game.
 
-        Parameters:
-            index (int): Index of the currently selected cell
-
-        Returns:
-            (int): Number to be displayed at the given index in the game string.
+class BoardView(tk.Canvas):
     """
-        if self._game_string[index] != UNEXPOSED:
-            return int(self._game_string[index])
-
-        number = 0
-        for neighbour in self.neighbour_directions(index):
-            if neighbour in self._pokemon_locations:
-                number += 1
-
-        return number
-
-    def big_fun_search(self, index):
-        """Searching adjacent cells to see if there are any Pokemon"s present.
-
-        Using some sick algorithms.
-
-        Find all cells which should be revealed when a cell is selected.
-
-        For cells which have a zero value (i.e. no neighbouring pokemons) all the cell"s
-        neighbours are revealed. If one of the neighbouring cells is also zero then
-        all of that cell"s neighbours are also revealed. This repeats until no
-        zero value neighbours exist.
-
-        For cells which have a non-zero value (i.e. cells with neighbour pokemons), only
-        the cell itself is revealed.
-
-        Parameters:
-            index (int): Index of the currently selected cell
-
-        Returns:
-            (list<int>): List of cells to turn visible.
-
-        References:
-            a1_solution(1).py
-            https://learn.uq.edu.au/webapps/blackboard/content/listContent.jsp?course_id=_128547_1&content_id=_5017694_1
-        """
-
-        queue = [index]
-        discovered = [index]
-        visible = []
-
-        if self._game_string[index] == FLAG:
-            return queue
-
-        number = self.number_at_cell(index)
-        if number != 0:
-            return queue
+    View of the Pokemon game board
 
-        while queue:
-            node = queue.pop()
-            for neighbour in self.neighbour_directions(node):
-                if neighbour in discovered:
-                    continue
+    Only the cells in the viewport, and VIEW_MARGIN cells around it, have canvas items. The items form a pool
+    of span x span slots, and the cell (row, column) is drawn by the slot (row % span, column % span). When
+    the board scrolls, the slots of the cells which left the viewport are moved to the cells coming in, so
+    the number of items is the same on any board size. The cells are at least MIN_CELL_SIZE pixels, a board
+    which does not fit scrolls.
 
-                discovered.append(neighbour)
-                if self._game_string[neighbour] != FLAG:
-                    number = self.number_at_cell(neighbour)
-                    if number == 0:
-                        queue.append(neighbour)
-                visible.append(neighbour)
-        return visible
-
-
-class BoardView(tk.Canvas):
-    """View of the Pokemon game board"""
+    The board can be zoomed through the cell sizes of zoom_levels. Below MIN_CELL_SIZE the slots are hidden
+    and the viewport is one image with a block of colour for each cell, made from the state codes of the
+    cells.
+    """
 
     def __init__(self, master, grid_size, board_width=600, *args, **kwargs):
         """Construct a board view from a game string.
@@ -391,36 +238,316 @@ class BoardView(tk.Canvas):
            """
         super().__init__(master, width=board_width, height=board_width, *args, **kwargs)
         self._master = master
-        self._grid_size = grid_size
         self._board_width = board_width
-        self._radius = (self._board_width / self._grid_size) / 2  # use for calculating the position
-        self._length = self._radius * 2
+        self._cell_items = array('i')  # the canvas item of each slot, kept from zoom to zoom
+        self._live_slots = 0  # how many slots are in use, the items of the others are hidden
+        self._slot_cells = None  # the cell each slot draws (-1 for none yet), None when drawn as blocks
+        self._span = 0  # how many slots in a row and in a column
+        self._first = None  # (row, column) of the first cell the slots draw
+        self._blocks_item = None  # the image item of the colour blocks
+        self._blocks_image = None
+        self._blocks_region = None  # what the blocks image shows, None to draw it again
+        self._shown = None  # the state code each cell is drawn with
+        self._hover = None  # the index of the cell under the mouse
+        self._overlay = None  # the border of the cell under the mouse, one item moved from cell to cell
+        self._region = (0, 0)  # the width and height of the scroll region, the board plus the scrollbars
+        self._scrollbars = (tk.Scrollbar(master, orient=tk.HORIZONTAL, command=self.xview),
+                            tk.Scrollbar(master, orient=tk.VERTICAL, command=self.yview))
+        self.configure(xscrollcommand=self.scrolled_x, yscrollcommand=self.scrolled_y)
+        for sequence in ('<MouseWheel>', '<Shift-MouseWheel>', '<Control-MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.bind(sequence, self.scroll_wheel)
+        self.set_grid_size(grid_size)
+
+    def set_grid_size(self, grid_size):
+        """ Change the size of the board, the cells are made again by the next draw_board """
+        self._grid_size = grid_size
+        self.set_length(self.fit_length())
+        self._shown = None
 
-    def draw_board(self, board):
-        """ Draw the game board """
+    def fit_length(self):
+        """ Return the cell size which fits the board in the view, or MIN_CELL_SIZE if the board is too big """
+        return max(self._board_width / self._grid_size, MIN_CELL_SIZE)
+
+    def set_length(self, length):
+        """ Change the cell size in pixels """
+        self._length = length
+        self._radius = length / 2  # use for calculating the position
+
+    def zoom_levels(self):
+        """
+        Return the cell sizes the board can be zoomed to, biggest first: the mip levels and the size which
+        fits the board in the view, then the colour blocks down to the first one showing the whole board.
+        """
+        fit = self.fit_length()
+        levels = sorted({fit}.union(SPRITE_LEVELS), reverse=True) + list(BLOCK_LEVELS)
+        for i, length in enumerate(levels):
+            if length <= fit and self._grid_size * length <= self._board_width:
+                return levels[:i + 1]
+        return levels
+
+    def assign_sprites(self):
+        """ Choose the images of a new game, the cells of this board are plain colours """
+        pass
 
+    def draw_board(self, board):
+        """ Draw the game board, only the cells which differ from the drawn board are changed """
+        codes = board.translate(BOARD_CODES).encode('latin-1')
+        if self._shown is None or len(self._shown) != len(codes):
+            self.create_cells(len(codes))
+        shown = self._shown
+        changes = []
+        for start in range(0, len(codes), DIFF_CHUNK):
+            end = min(start + DIFF_CHUNK, len(codes))
+            if codes[start:end] != shown[start:end]:
+                changes.extend((i, codes[i]) for i in range(start, end) if codes[i] != shown[i])
+        self.draw_codes(changes)
+
+    def create_cells(self, cell_count):
+        """ Lay a new board out, all unexposed, and scroll to the top left """
         self.delete(tk.ALL)
-        for i in range(len(board)):
-            x = i % self._grid_size
-            y = i // self._grid_size
-            if board[i] == UNEXPOSED:
-                self.create_rectangle(x * self._length, y * self._length, self._length * (x + 1),
-                                      self._length * (y + 1), fill='dark green')
+        self._cell_items = array('i')
+        self._text_items = array('i')  # the number text of each slot
+        self._slot_texts = []  # the text each slot shows
+        self._live_slots = 0
+        self._blocks_item = None
+        self._shown = bytearray([UNEXPOSED_CODE]) * cell_count
+        self._hover = None
+        self._overlay = self.create_rectangle(0, 0, 0, 0, width=3, state=tk.HIDDEN)
+        self.layout()
+        self.xview_moveto(0)
+        self.yview_moveto(0)
+        self.draw_viewport()
+
+    def layout(self):
+        """ Set the scroll region, the scrollbars and the slots (or the blocks) of the cell size """
+        length = self._length
+        board_size = self._grid_size * length
+        increment = max(length, MIN_CELL_SIZE)
+        horizontal, vertical = self._scrollbars
+        if board_size > self._board_width:
+            # the scrollbars lie on the edges of the viewport, so the region runs past the board by their
+            # width to bring the last column and row out from under them
+            bar_width, bar_height = vertical.winfo_reqwidth(), horizontal.winfo_reqheight()
+            horizontal.place(in_=self, relx=0, rely=1.0, relwidth=1.0, width=-bar_width, anchor=tk.SW)
+            vertical.place(in_=self, relx=1.0, rely=0, relheight=1.0, height=-bar_height, anchor=tk.NE)
+            self._region = (board_size + bar_width, board_size + bar_height)
+        else:
+            self._region = (board_size, board_size)
+            horizontal.place_forget()
+            vertical.place_forget()
+        self.configure(scrollregion=(0, 0) + self._region, xscrollincrement=increment, yscrollincrement=increment)
+
+        self._first = None
+        self._blocks_region = None
+        if length >= MIN_CELL_SIZE:
+            visible = math.ceil(self._board_width / length) + 1  # a scrolled viewport cuts a cell at each edge
+            self._span = min(self._grid_size, visible + 2 * VIEW_MARGIN)
+            made = len(self._cell_items)
+            self.resize_pool(self._span ** 2)
+            # -1 is a new item, still unexposed, -2 an item used before which has to be drawn
+            self._slot_cells = array('i', [-2]) * min(made, self._span ** 2)
+            self._slot_cells.extend(array('i', [-1]) * (self._span ** 2 - len(self._slot_cells)))
+            if self._blocks_item is not None:
+                self.itemconfigure(self._blocks_item, state=tk.HIDDEN)
+        else:
+            self._span = 0
+            self._slot_cells = None
+            self.resize_pool(0)
+
+    def resize_pool(self, slot_count):
+        """ Make or show the items of slot_count slots and hide the others, the items are kept for the next zoom """
+        for slot in range(slot_count, self._live_slots):
+            self.show_slot(slot, tk.HIDDEN)
+        for slot in range(self._live_slots, min(slot_count, len(self._cell_items))):
+            self.show_slot(slot, tk.NORMAL)
+        if len(self._cell_items) < slot_count:
+            while len(self._cell_items) < slot_count:
+                self.create_slot()
+            self.tag_raise(self._overlay)
+        self._live_slots = slot_count
+
+    def create_slot(self):
+        """ Make the items of one more slot, they are put on their cells by draw_viewport """
+        self._cell_items.append(self.create_rectangle(0, 0, 0, 0, fill=CELL_COLOURS[UNEXPOSED]))
+        self._text_items.append(self.create_text(0, 0, text=''))
+        self._slot_texts.append('')
+
+    def show_slot(self, slot, state):
+        """ Show (tk.NORMAL) or hide (tk.HIDDEN) the items of a slot """
+        self.itemconfigure(self._cell_items[slot], state=state)
+        self.itemconfigure(self._text_items[slot], state=state)
+
+    def draw_viewport(self):
+        """ Give the slots to the cells in and around the viewport, only the slots whose cell changed are moved """
+        if self._shown is None:
+            return
+        if self._slot_cells is None:
+            self.draw_blocks()
+            return
+        grid_size = self._grid_size
+        span = self._span
+        first_row = min(max(0, int(self.canvasy(0) // self._length) - VIEW_MARGIN), grid_size - span)
+        first_column = min(max(0, int(self.canvasx(0) // self._length) - VIEW_MARGIN), grid_size - span)
+        if self._first == (first_row, first_column):
+            return
+        self._first = first_row, first_column
+        slot_cells = self._slot_cells
+        for row in range(first_row, first_row + span):
+            row_slot = (row % span) * span
+            for column in range(first_column, first_column + span):
+                slot = row_slot + column % span
+                cell = row * grid_size + column
+                if slot_cells[slot] != cell:
+                    new_slot = slot_cells[slot] == -1  # it was made unexposed
+                    slot_cells[slot] = cell
+                    self.place_slot(slot, row, column)
+                    if not new_slot or self._shown[cell] != UNEXPOSED_CODE:
+                        self.draw_slot(slot, cell)
+
+    def draw_blocks(self):
+        """
+        Draw the cells in the viewport as one image, a block of colour for each cell (or one pixel for a few
+        cells when they are smaller than a pixel), made by translating the state codes of the cells.
+        """
+        length = self._length
+        grid_size = self._grid_size
+        step = max(1, round(1 / length))  # cells in a pixel
+        first_row = int(self.canvasy(0) // length)
+        first_row -= first_row % step
+        first_column = int(self.canvasx(0) // length)
+        first_column -= first_column % step
+        region = (first_row, first_column, length)
+        if region == self._blocks_region:
+            return
+        self._blocks_region = region
+
+        cells_across = math.ceil(self._board_width / length) + step
+        rows = range(first_row, min(grid_size, first_row + cells_across), step)
+        columns = range(first_column, min(grid_size, first_column + cells_across), step)
+        shown = self._shown
+        codes = b''.join(shown[row * grid_size + columns.start:row * grid_size + columns.stop:step] for row in rows)
+        pixels = bytearray(3 * len(codes))
+        for channel in range(3):
+            pixels[channel::3] = codes.translate(BLOCK_CHANNELS[channel])
+        image = tk.PhotoImage(data=b'P6 %d %d 255\n' % (len(columns), len(rows)) + bytes(pixels), format='PPM')
+        if length > 1:
+            image = image.zoom(int(length))
+        self._blocks_image = image
+        if self._blocks_item is None:
+            self._blocks_item = self.create_image(0, 0, anchor=tk.NW)
+            self.tag_lower(self._blocks_item)
+        self.coords(self._blocks_item, first_column * length, first_row * length)
+        self.itemconfigure(self._blocks_item, image=image, state=tk.NORMAL)
+
+    def zoom(self, step, pixel=None):
+        """
+        Zoom in (step > 0) or out (step < 0) by step levels of zoom_levels, the cell under pixel stays where
+        it is. Only the slots (or the blocks) of the viewport are drawn, so it takes about the same time on
+        any board size.
 
+        Parameters:
+            step (int): how many levels to zoom in, negative to zoom out
+            pixel (tuple<int, int>): the pixel of the window which stays in place, None for the centre
 
-            elif board[i] == FLAG:
-                self.create_rectangle(x * self._length, y * self._length, self._length * (x + 1),
-                                      self._length * (y + 1), fill='red')
+        Returns:
+            (bool): True if the cell size changed
+        """
+        levels = self.zoom_levels()
+        level = min(range(len(levels)), key=lambda i: abs(levels[i] - self._length))
+        new_level = max(0, min(len(levels) - 1, level - step))
+        if levels[new_level] == self._length:
+            return False
+        if pixel is None:
+            pixel = (self._board_width / 2, self._board_width / 2)
+        anchor_x = self.canvasx(pixel[0]) / self._length  # in cells
+        anchor_y = self.canvasy(pixel[1]) / self._length
+        self.clear_motion()
+        self.set_length(levels[new_level])
+        if self._shown is None:
+            return True
+        self.layout()
+        region_width, region_height = self._region
+        self.xview_moveto(max(0.0, (anchor_x * self._length - pixel[0]) / region_width))
+        self.yview_moveto(max(0.0, (anchor_y * self._length - pixel[1]) / region_height))
+        self.draw_viewport()
+        return True
+
+    def slot_of(self, index):
+        """ Returns the slot drawing the cell at index, or None if the cell is out of the viewport. """
+        if self._slot_cells is None:
+            return None
+        row, column = divmod(index, self._grid_size)
+        slot = (row % self._span) * self._span + column % self._span
+        return slot if self._slot_cells[slot] == index else None
+
+    def place_slot(self, slot, row, column):
+        """ Move the items of a slot onto the cell at (row, column) """
+        length = self._length
+        self.coords(self._cell_items[slot], column * length, row * length, (column + 1) * length, (row + 1) * length)
+        self.coords(self._text_items[slot], length * (column + 0.5), length * (row + 0.5))
+
+    def draw_slot(self, slot, index):
+        """ Draw the cell at index with the items of its slot """
+        character = CELL_CHARACTERS[self._shown[index]]
+        self.itemconfigure(self._cell_items[slot], fill=CELL_COLOURS.get(character, 'light green'))
+        text = '' if character in CELL_COLOURS else character
+        if self._slot_texts[slot] != text:
+            self._slot_texts[slot] = text
+            self.itemconfigure(self._text_items[slot], text=text)
+
+    def draw_cells(self, cells):
+        """
+        Change only the cells given, so that a click costs the cells it changed and not the whole board.
+        The cells out of the viewport are only remembered, they are drawn when they are scrolled to.
 
-            elif board[i] == POKEMON:
-                self.create_rectangle(x * self._length, y * self._length, self._length * (x + 1),
-                                      self._length * (y + 1), fill='yellow')
+        Parameters:
+            cells (iterable<tuple<int, str>>): (index, character) of the cells to draw
+        """
+        self.draw_codes((i, CELL_CODES[character]) for i, character in cells)
 
-            else:
-                self.create_rectangle(x * self._length, y * self._length, self._length * (x + 1),
-                                      self._length * (y + 1), fill='light green')
+    def draw_codes(self, cells):
+        """
+        Change only the cells given, see draw_cells.
 
-                self.create_text(self._length * (x + 0.5), self._length * (y + 0.5), text=board[i])
+        Parameters:
+            cells (iterable<tuple<int, int>>): (index, state code) of the cells to draw
+        """
+        shown = self._shown
+        changed = False
+        for i, code in cells:
+            if shown[i] == code:
+                continue
+            shown[i] = code
+            changed = True
+            slot = self.slot_of(i)
+            if slot is not None:
+                self.draw_slot(slot, i)
+        if changed and self._slot_cells is None:
+            self._blocks_region = None
+            self.draw_blocks()
+
+    def scrolled_x(self, first, last):
+        """ The board scrolled sideways: move the scrollbar and the slots """
+        self._scrollbars[0].set(first, last)
+        self.draw_viewport()
+
+    def scrolled_y(self, first, last):
+        """ The board scrolled up or down: move the scrollbar and the slots """
+        self._scrollbars[1].set(first, last)
+        self.draw_viewport()
+
+    def scroll_wheel(self, event):
+        """
+        Scroll WHEEL_CELLS cells up or down with the mouse wheel, sideways with shift held down, or zoom
+        around the mouse with control held down
+        """
+        step = -WHEEL_CELLS if event.num == 4 or event.delta > 0 else WHEEL_CELLS
+        if event.state & 4:  # control
+            self.zoom(-1 if step > 0 else 1, (event.x, event.y))
+        elif event.state & 1:  # shift
+            self.xview_scroll(step, tk.UNITS)
+        else:
+            self.yview_scroll(step, tk.UNITS)
 
     def get_bbox(self, pixel):
         """ Returns the bounding box for a cell centered at the provided pixel coordinates.
@@ -440,23 +567,39 @@ class BoardView(tk.Canvas):
         return pixel_x, pixel_y
 
     def pixel_to_position(self, pixel):
-        """ Converts the supplied pixel to the position of the cell it is contained within. """
-        position_x = int(pixel[0] // self._length)
-        position_y = int(pixel[1] // self._length)
+        """ Converts the supplied pixel of the window (e.g. of an event) to the position of the cell it is in. """
+        position_x = int(self.canvasx(pixel[0]) // self._length)
+        position_y = int(self.canvasy(pixel[1]) // self._length)
 
         return position_x, position_y
 
-    def draw_motion(self, position):
-        """ Draw the border when mouse move into the cell """
+    def pixel_to_index(self, pixel):
+        """ Returns the index of the cell under the pixel, or None if the pixel is off the board. """
+        position_x, position_y = self.pixel_to_position(pixel)
+        if 0 <= position_x < self._grid_size and 0 <= position_y < self._grid_size:
+            return position_y * self._grid_size + position_x
+        return None
 
-        input_position_x, input_position_y = self.pixel_to_position(position)
-        input_pixel_x, input_pixel_y = self.position_to_pixel((input_position_x, input_position_y))
+    def draw_motion(self, position):
+        """ Draw the border when mouse move into the cell, the border is only moved when the cell changes """
+        index = self.pixel_to_index(position)
+        if index == self._hover:
+            return
+        if index is None:
+            self.clear_motion()
+            return
+        if self._hover is None:  # show it again, it was made above all the slots
+            self.itemconfigure(self._overlay, state=tk.NORMAL)
+        self._hover = index
+        input_pixel_x, input_pixel_y = self.position_to_pixel((index % self._grid_size, index // self._grid_size))
         up_bound, down_bound = self.get_bbox((input_pixel_x, input_pixel_y))
+        self.coords(self._overlay, up_bound[0], up_bound[1], down_bound[0], down_bound[1])
 
-        self.create_line(up_bound, (up_bound[0] + self._length, up_bound[1]), width=3)
-        self.create_line((up_bound[0] + self._length, up_bound[1]), down_bound, width=3)
-        self.create_line(down_bound, (down_bound[0] - self._length, down_bound[1]), width=3)
-        self.create_line((down_bound[0] - self._length, down_bound[1]), up_bound, width=3)
+    def clear_motion(self):
+        """ Remove the mouse over highlight """
+        if self._hover is not None:
+            self._hover = None
+            self.itemconfigure(self._overlay, state=tk.HIDDEN)
 
 
 class ImageBoardView(BoardView):
@@ -470,130 +613,75 @@ class ImageBoardView(BoardView):
                grid_size (int): the size of the game.
                board_width (int): the size of the board
        """
-        super().__init__(master, board_width)
-
-        self._master = master
-        self._board_width = board_width
-        self._grid_size = grid_size
-        self._radius = int((self._board_width / self._grid_size) / 2)
-        self._length = int(self._radius * 2)
-
-        long_glass = Image.open('images/unrevealed.gif')  # the unrevealed glass
-        self.long_glass = long_glass.resize((self._length, self._length), Image.ANTIALIAS)
-        self.long_glass = ImageTk.PhotoImage(self.long_glass)
-
-        short_glass = Image.open('images/unrevealed_moved.gif')  # the unrevealed glass when mouse in it
-        self.short_glass = short_glass.resize((self._length, self._length), Image.ANTIALIAS)
-        self.short_glass = ImageTk.PhotoImage(self.short_glass)
-
-        ball = Image.open('images/pokeball.gif')  # the pokeball when right click the cell
-        self.ball = ball.resize((self._length, self._length), Image.ANTIALIAS)
-        self.ball = ImageTk.PhotoImage(self.ball)
-
-        def resize(name):
-            """
-            Use this function to resize the image size in order to fit the board size
-            Args:
-                name: the name of the image
-
-            Returns:
-                the resize image
-            """
-            name = name.resize((self._length, self._length), Image.ANTIALIAS)
-            name = ImageTk.PhotoImage(name)
-            return name
-
-        self._pokemon_image = []  # a list that contains all the information about pokemon image
-        pokemon1 = Image.open('images/pokemon_sprites/charizard.gif')
-        pokemon1 = resize(pokemon1)
-
-        pokemon2 = Image.open('images/pokemon_sprites/cyndaquil.gif')
-        pokemon2 = resize(pokemon2)
-
-        pokemon3 = Image.open('images/pokemon_sprites/pikachu.gif')
-        pokemon3 = resize(pokemon3)
-
-        pokemon4 = Image.open('images/pokemon_sprites/psyduck.gif')
-        pokemon4 = resize(pokemon4)
-
-        pokemon5 = Image.open('images/pokemon_sprites/togepi.gif')
-        pokemon5 = resize(pokemon5)
-
-        pokemon6 = Image.open('images/pokemon_sprites/umbreon.gif')
-        pokemon6 = resize(pokemon6)
-
-        self._pokemon_image.append(pokemon1)
-        self._pokemon_image.append(pokemon2)
-        self._pokemon_image.append(pokemon3)
-        self._pokemon_image.append(pokemon4)
-        self._pokemon_image.append(pokemon5)
-        self._pokemon_image.append(pokemon6)
-
-        self._number_at_cell = []  # a list that contains all the information about number image
-
-        zero = Image.open('images/zero_adjacent.gif')
-        zero = resize(zero)
-
-        one = Image.open('images/one_adjacent.gif')
-        one = resize(one)
-
-        two = Image.open('images/two_adjacent.gif')
-        two = resize(two)
-
-        three = Image.open('images/three_adjacent.gif')
-        three = resize(three)
-
-        four = Image.open('images/four_adjacent.gif')
-        four = resize(four)
-
-        five = Image.open('images/five_adjacent.gif')
-        five = resize(five)
-
-        six = Image.open('images/six_adjacent.gif')
-        six = resize(six)
-
-        seven = Image.open('images/seven_adjacent.gif')
-        seven = resize(seven)
-
-        eight = Image.open('images/eight_adjacent.gif')
-        eight = resize(eight)
-
-        self._number_at_cell.append(zero)
-        self._number_at_cell.append(one)
-        self._number_at_cell.append(two)
-        self._number_at_cell.append(three)
-        self._number_at_cell.append(four)
-        self._number_at_cell.append(five)
-        self._number_at_cell.append(six)
-        self._number_at_cell.append(seven)
-        self._number_at_cell.append(eight)
-
-    def draw_board(self, board):
+        self._sprite_of = None  # the index of the pokemon image of each cell, chosen once a game
+        self._sprite_sets = {}  # cell size -> the images of the cells at that size
+        super().__init__(master, grid_size, board_width)
+
+    def fit_length(self):
+        """ Return the size of the cell images which fit the board in the view """
+        return sprite_size(self._board_width, self._grid_size)
+
+    def set_length(self, length):
+        """ Change the cell size in pixels, and take the images of that size when the cells are images """
+        super().set_length(length)
+        if length >= MIN_CELL_SIZE:
+            (self.long_glass, self.short_glass, self.ball, self._pokemon_image,
+             self._number_at_cell) = self.sprite_set(int(length))
+
+    def sprite_set(self, size):
+        """ Return the images of the cells at a size, they are taken from the shared sprite cache once """
+        sprites = self._sprite_sets.get(size)
+        if sprites is None:
+            sprites = self._sprite_sets[size] = (
+                SPRITES.get(UNREVEALED_IMAGE, size), SPRITES.get(UNREVEALED_MOVED_IMAGE, size),
+                SPRITES.get(POKEBALL_IMAGE, size), [SPRITES.get(asset, size) for asset in POKEMON_IMAGES],
+                [SPRITES.get(asset, size) for asset in NUMBER_IMAGES])
+        return sprites
+
+    def load_mip_levels(self):
+        """ Make the images of every mip level, so that no zoom has to wait for images to be scaled """
+        for size in SPRITE_LEVELS:
+            self.sprite_set(size)
+
+    def assign_sprites(self):
         """
-        Draw the image game board
-        Args:
-            board: the game string
-
-        Returns:
-            An image game board
+        Choose the pokemon image of every cell once for a new game, so that a pokemon keeps its image from
+        frame to frame and drawing it needs no random choice. Every cell gets one, so a pokemon moved away
+        from a safe first click has an image too.
         """
-        self.delete(tk.ALL)
-        for i in range(len(board)):
-            x = i % self._grid_size
-            y = i // self._grid_size
-            if board[i] == UNEXPOSED:
-                self.create_image(self._length * (x + 0.5), self._length * (y + 0.5), image=self.long_glass)
-
-            elif board[i] == FLAG:
-                self.create_image(self._length * (x + 0.5), self._length * (y + 0.5), image=self.ball)
-
-            elif board[i] == POKEMON:
-                self.create_image(self._length * (x + 0.5), self._length * (y + 0.5),
-                                  image=random.choice(self._pokemon_image))
-
-            else:
-                self.create_image(self._length * (x + 0.5), self._length * (y + 0.5),
-                                  image=self._number_at_cell[int(board[i])])
+        kinds = len(POKEMON_IMAGES)
+        self._sprite_of = random.randbytes(self._grid_size ** 2).translate(bytes(b % kinds for b in range(256)))
+
+    def create_cells(self, cell_count):
+        """ Lay a new board out, the pokemon images of a new size are chosen first """
+        if self._sprite_of is None or len(self._sprite_of) != cell_count:
+            self.assign_sprites()
+        super().create_cells(cell_count)
+
+    def create_slot(self):
+        """ Make the image item of one more slot, it is put on its cell by draw_viewport """
+        self._cell_items.append(self.create_image(0, 0, image=self.long_glass))
+
+    def show_slot(self, slot, state):
+        """ Show (tk.NORMAL) or hide (tk.HIDDEN) the image of a slot """
+        self.itemconfigure(self._cell_items[slot], state=state)
+
+    def place_slot(self, slot, row, column):
+        """ Move the image of a slot onto the cell at (row, column) """
+        self.coords(self._cell_items[slot], self._length * (column + 0.5), self._length * (row + 0.5))
+
+    def draw_slot(self, slot, index):
+        """ Draw the cell at index with the image of its slot """
+        code = self._shown[index]
+        if code == UNEXPOSED_CODE:
+            image = self.short_glass if index == self._hover else self.long_glass
+        elif code == FLAG_CODE:
+            image = self.ball
+        elif code == POKEMON_CODE:
+            image = self._pokemon_image[self._sprite_of[index]]
+        else:
+            image = self._number_at_cell[code]
+        self.itemconfigure(self._cell_items[slot], image=image)
 
     def draw_motion1(self, position):
         """
@@ -601,16 +689,29 @@ class ImageBoardView(BoardView):
          the image to change to the ‘unexposed moved.png’ image, whereas motion off a tall grass square should restore
          the image to the ‘unexposed.png’ image.
 
+        Only the image of the cell the mouse left and of the cell it entered are swapped, and only when the
+        mouse moves to another cell.
+
         Args:
             position: the position for the mouse currently on
-
-        Returns:
-            A new image game board
-
         """
-        input_position_x, input_position_y = self.pixel_to_position(position)
-        input_pixel_x, input_pixel_y = self.position_to_pixel((input_position_x, input_position_y))
-        self.create_image(input_pixel_x, input_pixel_y, image=self.short_glass)
+        index = self.pixel_to_index(position)
+        if index == self._hover:
+            return
+        self.clear_motion()
+        if index is not None:
+            self._hover = index
+            slot = self.slot_of(index)
+            if slot is not None and self._shown[index] == UNEXPOSED_CODE:
+                self.itemconfigure(self._cell_items[slot], image=self.short_glass)
+
+    def clear_motion(self):
+        """ Put the still grass back on the cell the mouse left """
+        if self._hover is not None:
+            slot = self.slot_of(self._hover)
+            if slot is not None and self._shown[self._hover] == UNEXPOSED_CODE:
+                self.itemconfigure(self._cell_items[slot], image=self.long_glass)
+            self._hover = None
 
 
 class StatusBar(tk.Frame):
@@ -629,7 +730,7 @@ class StatusBar(tk.Frame):
         self._master = master
 
         left_part = tk.Frame(self._master)  # left part of the status bar
-        ball_image = tk.PhotoImage(file='images/pokeball.gif')
+        ball_image = SPRITES.get(POKEBALL_IMAGE)
         label_ball = tk.Label(left_part, image=ball_image)
         label_ball.image = ball_image
         label_ball.pack(side=tk.LEFT)
@@ -640,7 +741,7 @@ class StatusBar(tk.Frame):
         left_part.pack(side=tk.LEFT)
 
         middle_part = tk.Frame(self._master)  # middle part of the status bar
-        clock_image = tk.PhotoImage(file='images/clock.gif')
+        clock_image = SPRITES.get(CLOCK_IMAGE)
         label_clock = tk.Label(middle_part, image=clock_image)
         label_clock.image = clock_image
         label_clock.pack(side=tk.LEFT)
@@ -668,9 +769,16 @@ class PokemonGame(object):
     """Game application that manages communication between the board model, board view/image board view and status bar.
     """
 
-    def __init__(self, master, grid_size=10, num_pokemon=8, task='TASK_ONE'):
-        """Create a new game app within a master widget"""
-        if grid_size > 10 or grid_size < 2:  # check whether the game is out of range
+    def __init__(self, master, grid_size=10, num_pokemon=8, task='TASK_ONE', no_guess=False,
+                 safe_first_click=None, frame_budget=FRAME_BUDGET, no_guess_timeout=NO_GUESS_TIMEOUT):
+        """Create a new game app within a master widget, no_guess=True only deals boards which can be won
+        without a guess, starting from a revealed cell (looked for in the background for up to
+        no_guess_timeout seconds), safe_first_click (SAFE_CELL or SAFE_AREA) keeps the first reveal of every
+        game away from the pokemons, frame_budget is the milliseconds between two drawings of the mouse
+        position"""
+        launch = time.perf_counter()
+        self._first_frame = None  # seconds from the start of the game to its first drawn frame, TASK_TWO only
+        if grid_size > MAX_GRID_SIZE or grid_size < MIN_GRID_SIZE:  # check whether the game is out of range
             messagebox.showwarning(title='Error', message='Grid size is out of range, please check')
             pass
         elif num_pokemon <= 0 or num_pokemon > grid_size ** 2:
@@ -682,9 +790,23 @@ class PokemonGame(object):
             self._master = master
             self._master.title = ('Pokemon Catch Game')
             self._master.geometry("600x800")
-            self._model = BoardModel(grid_size, num_pokemon)
+            self._model = BoardModel(grid_size, num_pokemon, safe_first_click=safe_first_click)
             self._num_pokemon = num_pokemon
             self._grid_size = grid_size
+            self._no_guess = no_guess
+            self._seed_cache = SeedCache(SEED_CACHE_FILE) if no_guess else None
+            self._search = NoGuessSearch(self._seed_cache) if no_guess else None  # one pool for every game
+            self._search_timeout = no_guess_timeout
+            self._search_after = None  # the after callback of the next look at the search
+            self._start = None  # the revealed first cell of a no-guess board
+
+            # the mouse motion events are coalesced, only the latest one is drawn once a frame
+            self._frame_budget = frame_budget
+            self._motion_event = None  # the latest motion event, not drawn yet
+            self._motion_after = None  # the after callback of the next frame
+            self._motion_handler = None  # motion1 or motion2
+            self._motion_processed = 0
+            self._motion_dropped = 0
 
             # create menu bar
             menubar = tk.Menu(self._master)
@@ -701,13 +823,21 @@ class PokemonGame(object):
             filemenu.add_command(label='Quit', command=self.quit_game)
             self._filename = None
 
+            # the view menu zooms around the centre of the board, control and the mouse wheel around the mouse
+            viewmenu = tk.Menu(menubar)
+            menubar.add_cascade(label="View", menu=viewmenu)
+            viewmenu.add_command(label='Zoom In', command=self.zoom_in)
+            viewmenu.add_command(label='Zoom Out', command=self.zoom_out)
+
             if self._task == 'TASK_ONE':  # task 1 and 2 individually
                 self._view = BoardView(self._master, grid_size)
                 self._view.draw_board(self._model._game_string)
                 self._view.bind('<Button-1>', self._left_click1)
                 self._view.bind('<Button-2>', self._right_click1)
                 self._view.bind('<Button-3>', self._right_click1)
-                self._view.bind('<Motion>', self.motion1)
+                self._view.bind('<Motion>', self.queue_motion)
+                self._motion_handler = self.motion1
+                self._view.bind('<Leave>', self.leave)
                 self._view.pack()
                 self._grid_size = grid_size
                 self.num_pokemon = num_pokemon
@@ -717,7 +847,9 @@ class PokemonGame(object):
                 self._view.bind('<Button-1>', self._left_click1)
                 self._view.bind('<Button-2>', self._right_click1)
                 self._view.bind('<Button-3>', self._right_click1)
-                self._view.bind('<Motion>', self.motion2)
+                self._view.bind('<Motion>', self.queue_motion)
+                self._motion_handler = self.motion2
+                self._view.bind('<Leave>', self.leave)
                 self._view.draw_board(self._model._game_string)
                 self._view.pack()
                 self._grid_size = grid_size
@@ -734,101 +866,209 @@ class PokemonGame(object):
                     minute = int((time.time() - self.current_time) / 60)
                     seconds = int(time.time() - self.current_time - minute * 60)
                     self._status.clock.configure(text="{}m {}s".format(minute, seconds))
-                    root.after(1000, config)
+                    self._master.after(1000, config)
                     return minute, seconds
 
                 self._status.clock.after(1000, config)
                 self._status.restart_game_button.config(command=self.restart_game)
                 self._status.pack(side=tk.TOP)
 
+                # the idle callbacks run in order, so this one runs once the board has been drawn
+                self._master.after_idle(self.first_frame, launch)
+
+            if no_guess:
+                self.place_no_guess()
+
+    def first_frame(self, launch):
+        """ Log the time to the first frame, then make the mip levels of the sprites and save the images of the
+        common board sizes in the background"""
+        self._first_frame = time.perf_counter() - launch
+        loaded, scaled = SPRITES.get_disk_counts()
+        LOGGER.info("First frame after %.0f ms (%d images from %s, %d scaled)",
+                    self._first_frame * 1000, loaded, SPRITE_CACHE_DIR, scaled)
+        sizes = [sprite_size(self._view._board_width, grid_size) for grid_size in COMMON_GRID_SIZES]
+        SPRITES.fill_in_background(SPRITE_LEVELS + tuple(sizes))
+        self._master.after_idle(self._view.load_mip_levels)
+
+    def zoom_in(self):
+        """ Show bigger cells, around the centre of the board"""
+        self._view.zoom(1)
+
+    def zoom_out(self):
+        """ Show smaller cells, down to colour blocks for the whole board"""
+        self._view.zoom(-1)
+
+    def get_first_frame_time(self):
+        """ Return the seconds from the start of the game to its first frame, None until it is drawn"""
+        return self._first_frame
+
+    def queue_motion(self, event):
+        """ Keep only the latest mouse position, it is drawn by the next frame"""
+        if self._motion_event is not None:
+            self._motion_dropped += 1
+        self._motion_event = event
+        if self._motion_after is None:
+            self._motion_after = self._master.after(self._frame_budget, self.flush_motion)
+
+    def flush_motion(self):
+        """ Draw the latest mouse position, at most once a frame"""
+        self._motion_after = None
+        event, self._motion_event = self._motion_event, None
+        if event is not None:
+            self._motion_processed += 1
+            self._motion_handler(event)
+
+    def get_motion_counts(self):
+        """ Return (processed, dropped), how many motion events were drawn and how many were skipped"""
+        return self._motion_processed, self._motion_dropped
+
     def motion1(self, event):
         """ Use this in Task one when the mouse is moving"""
         if not self._model.check_win():
             event_x, event_y = event.x, event.y
-            self._view.draw_board(self._model._game_string)
             self._view.draw_motion((event_x, event_y))
 
     def motion2(self, event):
         """ Use this in Task two when the mouse is moving"""
         if not self._model.check_win():
             x, y = event.x, event.y
-            pixel = (x, y)
-            position = self._view.pixel_to_position(pixel)
-            index = self._model.position_to_index(position)
-            if index > len(self._model._game_string):
-                pass
-            else:
-                if self._model._game_string[index] == UNEXPOSED:
-                    self._view.draw_board(self._model._game_string)
-                    self._view.draw_motion1((x, y))
+            self._view.draw_motion1((x, y))
+
+    def leave(self, event):
+        """ Remove the mouse over highlight when the mouse leaves the board"""
+        if self._motion_event is not None:  # it would put the highlight back
+            self._motion_event = None
+            self._motion_dropped += 1
+        self._view.clear_motion()
 
     def update_status(self):
         """ Update the pokeball and attempted catches information in the status bar"""
         if self._task == 'TASK_TWO':
             self._status.attemped_catches.config(
-                text="{0} attempted catches".format(self._model._game_string.count(FLAG)))
+                text="{0} attempted catches".format(self._model.get_num_attempted_catches()))
             self._status.remain_balls.config(
                 text="{0} pokeballs left".format(self._num_pokemon
-                                                 - self._model._game_string.count(FLAG)))
+                                                 - self._model.get_num_attempted_catches()))
 
     def save_game(self):
-        """ Save the current game as a .txt file"""
+        """ Save the current game as a binary save file (see pokemon_engine.savegame)"""
         if self._filename is None:
-            filename = filedialog.asksaveasfilename()
-            if '.txt' in filename and len(filename) > 4:  # check whether the user use the correct file name format
+            filename = filedialog.asksaveasfilename(defaultextension=SAVE_EXTENSION, filetypes=SAVE_FILE_TYPES)
+            if filename.endswith(SAVE_EXTENSION) and len(filename) > len(SAVE_EXTENSION):
                 self._filename = filename
             else:
                 reply = messagebox.askyesno(title='File Name Error',
-                                            message="Please enter the correct format file name (end with '.txt')")
+                                            message="Please enter the correct format file name (end with '{0}')"
+                                            .format(SAVE_EXTENSION))
                 if reply == messagebox.YES:
-                    filename = filedialog.asksaveasfilename()
-                    if '.txt' in filename and len(filename) > 4:
+                    filename = filedialog.asksaveasfilename(defaultextension=SAVE_EXTENSION,
+                                                            filetypes=SAVE_FILE_TYPES)
+                    if filename.endswith(SAVE_EXTENSION) and len(filename) > len(SAVE_EXTENSION):
                         self._filename = filename
                 if reply == messagebox.NO:
                     pass
 
         if self._filename:
-            fd = open(self._filename, 'w')
-            game_string = self._model._game_string
-            pokemon_location = str(self._model._pokemon_locations)
-            grid_size = str(self._grid_size)
-
-            fd.write(game_string + '\n')
-            fd.write(pokemon_location + '\n')
-            fd.write(grid_size + '\n')
-            fd.close()
+            save_board(self._model, self._filename)
 
     def load_game(self):
         """ Load the previous game from the computer"""
         try:
-            filename = filedialog.askopenfilename()
-
-            self._model._game_string = self.get_line_context(filename, 1)
-            self._model._pokemon_locations = tuple(eval(self.get_line_context(filename, 2)))
-            self._model._grid_size = int(self.get_line_context(filename, 3))
-            self._num_pokemon = len(self._model._pokemon_locations)
+            filename = filedialog.askopenfilename(filetypes=SAVE_FILE_TYPES)
+
+            load_board(self._model, filename)
+            self.cancel_no_guess()
+            self._num_pokemon = len(self._model.get_locations())
+            self._start = None
+            if self._model.get_grid_size() != self._grid_size:  # the images of the new size come from the cache
+                self._grid_size = self._model.get_grid_size()
+                self._view.set_grid_size(self._grid_size)
+            self._view.assign_sprites()
             self.update_status()
             self._view.draw_board(self._model._game_string)
             self.current_time = time.time()
 
-        except:  # if cannot find the file, then restart the game
+        except (OSError, TypeError, ValueError):  # no file was chosen, or it cannot be read as a save file
             self.restart_game()
 
-    def get_line_context(self, filename, line_number):
-        """ Get the context of each line"""
-        return linecache.getline(filename, line_number).strip()
+    def place_no_guess(self):
+        """ Look for a board which can be won without a guess in the background, the clicks wait for it """
+        self.cancel_no_guess()
+        found = self._search.start(self._grid_size, self._num_pokemon, self._search_timeout)
+        if found is not None:  # from the cache
+            self.deal_no_guess(found)
+            return
+        self._view.config(cursor='watch')
+        self._search_after = self._master.after(SEARCH_POLL, self.poll_no_guess)
+
+    def poll_no_guess(self):
+        """ Deal the board once the search has found it, or a random one when it ran out of time """
+        self._search_after = None
+        found = self._search.poll()
+        if found is None and self._search.is_searching():
+            self._search_after = self._master.after(SEARCH_POLL, self.poll_no_guess)
+            return
+        self._view.config(cursor='')
+        self.deal_no_guess(found)
+        if found is None:
+            messagebox.showinfo(title='No-guess board',
+                                message='No board which can be won without a guess was found in {0:g} s, '
+                                        'this board may need a guess.'.format(self._search_timeout))
+
+    def deal_no_guess(self, found):
+        """ Put the board found, (seed, start), or a random board for None, on the view """
+        if found is None:
+            self._model.get_pokemon_locations()
+            self._start = None
+        else:
+            seed, self._start = found
+            self._model.get_pokemon_locations(seed)
+        self._seed_cache.save()
+        self.reveal_start()
+        self.show_new_board()
+
+    def cancel_no_guess(self):
+        """ Stop looking for a no-guess board, e.g. when a game is loaded instead """
+        if self._search_after is not None:
+            self._master.after_cancel(self._search_after)
+            self._search_after = None
+            self._view.config(cursor='')
+        if self._search is not None:
+            self._search.cancel()
+
+    def is_dealing(self):
+        """ Return True while the board of a new game is being looked for, the clicks are ignored """
+        return self._search is not None and self._search.is_searching()
+
+    def reveal_start(self):
+        """ Start the board again, with the first cell of a no-guess board revealed """
+        self._model.restart_game()
+        if self._start is not None:
+            self._model.reveal(self._start)
 
     def restart_game(self):
         """ Restart the game, do not change pokemon locations"""
-        self._view.draw_board(self._model.restart_game())
+        if self.is_dealing():  # the board of the new game is still being looked for
+            return
+        self.reveal_start()
+        self._view.draw_board(self._model._game_string)
         self._num_pokemon = len(self._model._pokemon_locations)
         self.current_time = time.time()
         self.update_status()
 
     def new_game(self):
         """ New game, change pokemon locations"""
+        if self._no_guess:
+            self.place_no_guess()  # the board is shown once it is found
+            return
         self._model.get_pokemon_locations()
-        self._view.draw_board(self._model.restart_game())
+        self._model.restart_game()
+        self.show_new_board()
+
+    def show_new_board(self):
+        """ Draw a new board and start its clock"""
+        self._view.assign_sprites()
+        self._view.draw_board(self._model._game_string)
         self.current_time = time.time()
         self._num_pokemon = len(self._model._pokemon_locations)
         self.update_status()
@@ -841,6 +1081,8 @@ class PokemonGame(object):
         """ Quit the current game and back to desktop"""
         reply = messagebox.askquestion(type=messagebox.YESNO, title='Quit', message='Do you really want to quit?')
         if reply == messagebox.YES:
+            if self._search is not None:
+                self._search.close()
             quit()
         if reply == messagebox.NO:
             pass
@@ -848,14 +1090,15 @@ class PokemonGame(object):
     def draw_pokemon(self):
         """ Draw the pokemon when the game is loss"""
         for i in self._model._pokemon_locations:
-            self._model.replace_character_at_index(i, POKEMON)
-        self._view.draw_board(self._model._game_string)
+            self._model.set_cell(i, POKEMON)
+        self._view.draw_cells((i, POKEMON) for i in self._model._pokemon_locations)
 
     def play_game(self, index):
         """ Flag and un-Flag cell, and check whether the user is win. """
         if not self._model.check_win():
-            if self._model._game_string[index] != FLAG:
-                if index in self._model._pokemon_locations:
+            if self._model.get_cell(index) != FLAG:
+                self._model.protect_first_click(index)
+                if self._model.is_pokemon(index):
                     self.draw_pokemon()
                     self._master.update()
                     reply = messagebox.askquestion(type=messagebox.YESNO, title="Game Over",
@@ -869,9 +1112,9 @@ class PokemonGame(object):
 
 
                 else:
-                    self._model._game_string = self._model.reveal_cells(index)
+                    changes = self._model.reveal(index)
 
-                    self._view.draw_board(self._model._game_string)
+                    self._view.draw_cells((cell, str(number)) for cell, number in changes)
 
 
         else:
@@ -882,16 +1125,17 @@ class PokemonGame(object):
 
     def _left_click1(self, event):
         """ Get x, y coordinates of click
-            Convert x, y coordinates to position and then to index in the game
+            Convert x, y coordinates to the index in the game, clicks off the board are ignored
             Reveal the cell at index in BoardModel
             Sends new state to controller
             Update game view
         """
-        if POKEMON not in self._model._game_string:
-            x, y = event.x, event.y
-            pixel = (x, y)
-            position = self._view.pixel_to_position(pixel)
-            index = self._model.position_to_index(position)
+        if self.is_dealing():
+            return
+        if not self._model.count_cells(POKEMON):
+            index = self._view.pixel_to_index((event.x, event.y))
+            if index is None:  # a zoomed out board leaves part of the canvas empty
+                return
             self.play_game(index)
             self._master.update()
             if self._model.check_win():
@@ -901,27 +1145,28 @@ class PokemonGame(object):
     def draw_flag(self, index):
         """ Flag the cell when right click the mouse"""
         self._model.flag_cell(index)
-        self._view.draw_board(self._model._game_string)
+        self._view.draw_cells([(index, self._model.get_cell(index))])
         self.update_status()
         self._master.update()
 
     def _right_click1(self, event):
         """ Get x, y coordinates of click
-            Convert x, y coordinates to position and then to index in the game
+            Convert x, y coordinates to the index in the game, clicks off the board are ignored
             Flag the cell at index in BoardModel
             Sends new state to controller
             Update game view
         """
+        if self.is_dealing():
+            return
         if self._model.check_win() == False:
-            x, y = event.x, event.y
-            pixel = (x, y)
-            position = self._view.pixel_to_position(pixel)
-            index = self._model.position_to_index(position)
+            index = self._view.pixel_to_index((event.x, event.y))
+            if index is None:  # a zoomed out board leaves part of the canvas empty
+                return
 
-            if self._model._game_string[index] != FLAG and self._model._game_string.count(FLAG) < self._num_pokemon:
+            if self._model.get_cell(index) != FLAG and self._model.get_num_attempted_catches() < self._num_pokemon:
                 self.draw_flag(index)
 
-            elif self._model._game_string[index] == FLAG:
+            elif self._model.get_cell(index) == FLAG:
                 self.draw_flag(index)
 
             else:
@@ -932,15 +1177,21 @@ class PokemonGame(object):
                 quit()
 
 
-root = tk.Tk()
-root.title('Pokemon Games')
+def main():
+    """ Start the GUI of the game """
+    root = tk.Tk()
+    root.title('Pokemon Games')
+
+    label = tk.Label(root, text='Pokemon: Got 2 Find Them All!', font=('Tahoma', 40), width=70, height=2, fg='white',
+                     bg='#d26d6a')
+    label.pack(side=tk.TOP)
 
-label = tk.Label(root, text='Pokemon: Got 2 Find Them All!', font=('Tahoma', 40), width=70, height=2, fg='white',
-                 bg='#d26d6a')
-label.pack(side=tk.TOP)
+    # Please input 'TASK_ONE' when checking function about task one, input 'TASK_TWO' when checking function about
+    # task two
+    PokemonGame(root, 10, 15, 'TASK_ONE')  # PokemonGame(root, grid_size, num_pokemon, task, no_guess=False)
 
-# Please input 'TASK_ONE' when checking function about task one, input 'TASK_TWO' when checking function about task two
-PokemonGame(root, 10, 15, 'TASK_ONE')  # PokemonGame(root, grid_size, num_pokemon, task)
+    root.mainloop()
 
 
-root.mainloop()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark of the board model on big boards
+
+Measures how long a new board takes to set up, how long a click (a reveal of a safe unexposed cell,
+followed by the win check) takes, and how much memory the board uses (traced with tracemalloc). The
+table of supported sizes in README.md comes from this script. It also measures the cold import time of the engine.
+
+Usage:
+    python benchmark.py [grid_size ...]
+"""
+
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from pokemon_engine import BoardModel, UNEXPOSED_CODE
+from pokemon_engine import topology
+
+SIZES = (100, 250, 500, 1000, 2000)
+DENSITY = 0.15  # the same pokemon density as the default 10 x 10 game with 15 pokemons
+CLICKS = 500
+
+
+def board_memory(grid_size, num_pokemon, seed, clicks):
+    """
+    Return the bytes allocated by a board of grid_size after the clicks, with its neighbour tables, the
+    pokemon locations and the frontier. The shared tables of the size are dropped first so that they count.
+    """
+    topology._topologies.pop(grid_size, None)
+    tracemalloc.start()
+    try:
+        model = BoardModel(grid_size, num_pokemon, seed=seed)
+        for index in clicks:
+            model.reveal(index)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(times, fraction):
+    """ Return the value at fraction (0 - 1) of the sorted times. """
+    times = sorted(times)
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+
+def measure(grid_size, density=DENSITY, clicks=CLICKS, seed=0):
+    """
+    Reveal random safe cells of a board of grid_size and time them.
+
+    The clicks have a random stream of their own: with the seed of the board they would replay its
+    pokemon sample and hit pokemons. Cells with a pokemon are skipped, so every timed click is a reveal
+    (and a flood fill when it opens a 0).
+
+    Parameters:
+        grid_size (int): the size of the game
+        density (float): the share of the cells with a pokemon
+        clicks (int): how many clicks to time, fewer if the board runs out of safe cells
+        seed (int): the seed of the board and of the clicks
+
+    Returns:
+        (dict): the setup time, median / 99th percentile / worst click time (in seconds), the number of
+                clicks and the memory
+    """
+    num_pokemon = int(grid_size ** 2 * density)
+    start = time.perf_counter()
+    model = BoardModel(grid_size, num_pokemon, seed=seed)
+    setup = time.perf_counter() - start
+
+    picker = random.Random("clicks-{0}".format(seed))
+    played = []
+    click_times = []
+    while len(played) < clicks and model.get_num_unexposed() > num_pokemon:
+        index = picker.randrange(grid_size ** 2)
+        if model.is_pokemon(index) or model.get_cell_code(index) != UNEXPOSED_CODE:
+            continue
+        start = time.perf_counter()
+        model.reveal(index)
+        model.check_win()
+        click_times.append(time.perf_counter() - start)
+        played.append(index)
+
+    return {'setup': setup, 'median': percentile(click_times, 0.5), 'p99': percentile(click_times, 0.99),
+            'worst': max(click_times), 'clicks': len(played),
+            'memory': board_memory(grid_size, num_pokemon, seed, played)}
+
+
+def measure_import(module='pokemon_engine', runs=5):
+    """
+    Return the best cold import time (in seconds) of a module, each run is a new interpreter.
+
+    The time comes from python -X importtime, so the start up of the interpreter itself is not counted.
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                                capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == module:
+                cumulative = int(parts[1]) / 1000000
+                best = cumulative if best is None else min(best, cumulative)
+    return best
+
+
+def main(sizes):
+    """ Print the results of every size as a markdown table. """
+    print("cold import of pokemon_engine: {0:.1f} ms".format(measure_import() * 1000))
+    print()
+    print("| grid size | cells | setup | reveals | median reveal | p99 reveal | worst reveal | board memory |")
+    print("|---|---|---|---|---|---|---|---|")
+    for grid_size in sizes:
+        result = measure(grid_size)
+        print("| {0} x {0} | {1:,} | {2:.2f} s | {3} | {4:.3f} ms | {5:.3f} ms | {6:.3f} ms | {7:.1f} MB |".format(
+            grid_size, grid_size ** 2, result['setup'], result['clicks'], result['median'] * 1000,
+            result['p99'] * 1000, result['worst'] * 1000, result['memory'] / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or SIZES)
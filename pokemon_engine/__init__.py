@@ -0,0 +1,16 @@
+"""
+Headless engine of the Pokemon Game
+
+Everything needed to create and play a board, with no tkinter or PIL import, e.g.
+
+    from pokemon_engine import BoardModel
+    model = BoardModel(10, 15, seed=1)
+    model.reveal(0)
+"""
+
+from .topology import UP, DOWN, LEFT, RIGHT, DIRECTIONS, Topology, GridTopology, get_topology
+from .board import (POKEMON, FLAG, UNEXPOSED, UNEXPOSED_CODE, FLAG_CODE, POKEMON_CODE, CELL_CHARACTERS,
+                    DENSE, SPARSE, BACKENDS, SAFE_CELL, SAFE_AREA, MIN_GRID_SIZE, MAX_GRID_SIZE, place_pokemon,
+                    FrontierView, BoardModel)
+from .simulation import (REVEAL, FLAG_MOVE, WON, LOST, UNFINISHED, GameSpec, GameResult, BatchReport,
+                         apply_move, play_game, simulate_games, random_policy)
@@ -0,0 +1,64 @@
+"""
+Atomic file writes
+
+A file written with write_atomic is either the old file or the whole new one, even after a crash or a
+power loss: the data goes to a temporary file next to it, is flushed to the disk, and only then renamed
+over the old file.
+"""
+
+import os
+import stat
+import tempfile
+
+# the umask can only be read by setting it, which is done once here, before any thread writes files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _sync_directory(directory):
+    """ Flush the rename in directory to the disk, where the system allows it (not on Windows) """
+    try:
+        handle = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(handle)
+    except OSError:
+        pass
+    finally:
+        os.close(handle)
+
+
+def _file_mode(path):
+    """ Return the permissions of the file at path, or those open() gives a new file if there is none """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def write_atomic(path, data):
+    """
+    Replace the file at path with data, keeping its permissions (a new file gets those of open()). If the
+    write fails, the temporary file is removed and the error is raised, the old file is left as it was.
+
+    Parameters:
+        path (str): the file to write
+        data (bytes): its whole content
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            output.write(data)
+            output.flush()
+            os.fsync(output.fileno())
+        os.chmod(temporary, _file_mode(path))  # mkstemp makes the file readable by its owner only
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+    _sync_directory(directory)
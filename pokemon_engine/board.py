@@ -0,0 +1,797 @@
+"""
+Board model of the Pokemon Game
+
+The game state and its rules, without any GUI, so that it can be imported by the GUI (a3.py), by
+simulations and by benchmarks on machines without a display.
+"""
+
+import random
+from collections import deque
+from collections.abc import Set
+
+from .topology import GridTopology, get_topology
+from .sparse import ChunkedArray, PokemonIndex, NeighbourCounts
+
+
+"""
+define some useful variables
+"""
+POKEMON = "☺"
+FLAG = "♥"
+UNEXPOSED = "~"
+
+"""
+state codes of each cell in the board array, 0 - 8 are the revealed numbers
+"""
+UNEXPOSED_CODE = 9
+FLAG_CODE = 10
+POKEMON_CODE = 11
+CELL_CHARACTERS = "012345678" + UNEXPOSED + FLAG + POKEMON  # the character of each state code
+CODE_TO_CHARACTER = str.maketrans({chr(code): character for code, character in enumerate(CELL_CHARACTERS)})
+CHARACTER_TO_CODE = str.maketrans({character: chr(code) for code, character in enumerate(CELL_CHARACTERS)})
+REVEALED_MASK = bytes(0xFF if code < UNEXPOSED_CODE else 0 for code in range(256))  # 0xFF for the revealed codes
+
+DENSE = "dense"  # every cell is kept in flat arrays, the fastest for boards which are played all over
+SPARSE = "sparse"  # only the touched tiles are kept, for huge boards which are mostly left unexposed
+BACKENDS = (DENSE, SPARSE)
+
+SAFE_CELL = "cell"  # the first reveal of a game never finds a pokemon
+SAFE_AREA = "area"  # nor do the cells around it, so that it opens up a 0
+SAFE_FIRST_CLICKS = (None, SAFE_CELL, SAFE_AREA)
+
+MIN_GRID_SIZE = 2
+MAX_GRID_SIZE = 2000  # see the table of supported sizes in README.md
+
+
+def place_pokemon(grid_size, num_pokemon, seed=None):
+    """
+    Choose the pokemon locations of a board, the same (grid_size, num_pokemon, seed) always gives the
+    same locations.
+
+    Parameters:
+        grid_size (int): the size of the game
+        num_pokemon (int): how many pokemons to place, at most one in each cell
+        seed (int | random.Random | None): the seed or random generator to place them with
+
+    Returns:
+        (tuple<int, ...>): the indexes of the pokemons
+    """
+    generator = seed if isinstance(seed, random.Random) else random.Random(seed)
+    cell_count = grid_size ** 2
+    num_pokemon = min(num_pokemon, cell_count)
+    if num_pokemon * 2 <= cell_count:
+        return tuple(generator.sample(range(cell_count), num_pokemon))
+
+    # on a crowded board it is cheaper to choose the empty cells instead
+    empty_cells = set(generator.sample(range(cell_count), cell_count - num_pokemon))
+    return tuple(index for index in range(cell_count) if index not in empty_cells)
+
+
+class FrontierView(Set):
+    """
+    A read only view of the frontier of a board. It follows the board as it changes, so take a copy
+    (set(view)) to keep it over a move, or to change the board while going through it.
+    """
+
+    __slots__ = ('_cells',)
+
+    def __init__(self, cells):
+        self._cells = cells
+
+    def __contains__(self, index):
+        return index in self._cells
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __repr__(self):
+        return "FrontierView({0} cells)".format(len(self._cells))
+
+
+class BoardModel(object):
+    """
+    This part will be used to store and manage the internal game state
+
+    There will have some code from Assignment 1
+    """
+
+    def __init__(self, grid_size, num_pokemon, seed=None, backend=DENSE, safe_first_click=None):
+        """
+        Construct the basic model of Pokemon Game
+
+        Args:
+            grid_size: the board size of the game
+            num_pokemon: how many pokemons in this game
+            seed: the seed (int) of the first board or a random.Random for all the boards,
+                  None for a random game
+            backend: how the board is stored, DENSE or SPARSE
+            safe_first_click: None, SAFE_CELL or SAFE_AREA, see set_safe_first_click
+        """
+        if backend not in BACKENDS:
+            raise ValueError("Unknown board backend: {0}".format(backend))
+        if safe_first_click not in SAFE_FIRST_CLICKS:
+            raise ValueError("Unknown first click mode: {0}".format(safe_first_click))
+
+        self._backend = backend
+        self._grid_size = grid_size
+        self._topology = None
+        self._use_topology()
+        self._num_pokemon = num_pokemon
+        self._cells = None  # the state code of each cell, see CELL_CHARACTERS
+        self._code_counts = None  # how many cells have each state code
+        self._frontier = None  # the revealed numbers next to an unexposed cell
+        self._game_string_cache = None
+        self._locations = None  # the pokemon locations as placed or loaded
+        self._moved_to = {}  # placed location -> where the first click moved the pokemon
+        self._moved_from = {}  # the other way round
+        self._safe_first_click = safe_first_click
+        self._pokemon_cells = None  # 1 for the cells holding a pokemon
+        self._pokemon_counts = None  # how many pokemons are next to each cell
+        self._visited = None  # marks of the cells met by the current search, cleared after every search
+        self._random = seed if isinstance(seed, random.Random) else random.Random(seed)  # seeds of new boards
+        self._seed = None
+        self._reset_cells()
+        self.get_pokemon_locations(None if isinstance(seed, random.Random) else seed)
+
+    def _use_topology(self):
+        """ Pick the neighbours of the current grid size, a sparse board never builds the neighbour tables. """
+        if self._backend == SPARSE:
+            self._topology = GridTopology(self._grid_size)
+        else:
+            self._topology = get_topology(self._grid_size)  # neighbour tables shared by all boards of this size
+
+    def get_backend(self):
+        """ Return how the board is stored, DENSE or SPARSE """
+        return self._backend
+
+    @property
+    def _game_string(self):
+        """
+        The game string of the board, it is only built from the board array when it is asked for
+        and kept until the next change of the board. A sparse board does not keep it, it would cost a
+        character for every cell.
+        """
+        if self._game_string_cache is not None:
+            return self._game_string_cache
+        game_string = bytes(self._cells).decode('latin-1').translate(CODE_TO_CHARACTER)
+        if self._backend != SPARSE:
+            self._game_string_cache = game_string
+        return game_string
+
+    @_game_string.setter
+    def _game_string(self, game_string):
+        """ Replace the whole board with a game string (e.g. a loaded game). """
+        self._set_cell_codes(game_string.translate(CHARACTER_TO_CODE).encode('latin-1'))
+
+    def _set_cell_codes(self, cells):
+        """
+        Replace the whole board with the state codes of all the cells (bytes). Every cell is read, so it
+        costs O(grid_size ** 2) on a sparse board too.
+        """
+        if self._backend == SPARSE:
+            self._cells = ChunkedArray.from_bytes(self._grid_size, cells, UNEXPOSED_CODE)
+        else:
+            self._cells = bytearray(cells)
+        self._code_counts = [self._cells.count(code) for code in range(len(CELL_CHARACTERS))]
+        self._frontier = set()
+        self._update_frontier(index for index, code in enumerate(cells) if 0 < code < UNEXPOSED_CODE)
+        self._game_string_cache = None
+
+    def get_game(self):
+        """ Return the game string when input the grid size."""
+        self._reset_cells()
+        return self._game_string
+
+    def _reset_cells(self):
+        """ Turn every cell back to unexposed. """
+        if self._backend == SPARSE:
+            self._cells = ChunkedArray(self._grid_size, UNEXPOSED_CODE)
+        else:
+            self._cells = bytearray([UNEXPOSED_CODE]) * self._grid_size ** 2
+        self._code_counts = [0] * len(CELL_CHARACTERS)
+        self._code_counts[UNEXPOSED_CODE] = len(self._cells)
+        self._frontier = set()
+        self._game_string_cache = None
+
+    def get_cell(self, index):
+        """ Return the character of the cell at index. """
+        return CELL_CHARACTERS[self._cells[index]]
+
+    def get_cell_code(self, index):
+        """ Return the state code of the cell at index (a number 0 - 8, UNEXPOSED_CODE, FLAG_CODE or POKEMON_CODE). """
+        return self._cells[index]
+
+    def get_cell_codes(self):
+        """
+        Return the array of the state codes of all the cells, for code which reads many cells.
+
+        It must not be changed, and it is replaced (not updated) by restart_game and load.
+        """
+        return self._cells
+
+    def set_cell(self, index, character):
+        """
+        Change the cell at index to a new character without building the game string.
+
+        Parameters:
+            index (int): The index of the cell.
+            character (str): The new character of the cell.
+        """
+        code = CELL_CHARACTERS.index(character)
+        self._code_counts[self._cells[index]] -= 1
+        self._code_counts[code] += 1
+        self._cells[index] = code
+        self._update_frontier(self._topology.neighbours(index) + [index])
+        self._game_string_cache = None
+
+    def count_cells(self, character):
+        """ Return how many cells on the board are showing the character. """
+        return self._code_counts[CELL_CHARACTERS.index(character)]
+
+    def get_num_unexposed(self):
+        """ Return how many cells are still unexposed (not counting the flagged cells). """
+        return self._code_counts[UNEXPOSED_CODE]
+
+    def get_num_revealed(self):
+        """ Return how many cells are showing a number. """
+        return sum(self._code_counts[:UNEXPOSED_CODE])
+
+    def restart_game(self):
+        """
+        Reset the game string but no not change the pokemon locations. The game string is not built, ask
+        for it with get_game or _game_string (on a huge sparse board it is grid_size ** 2 characters).
+        """
+        self._reset_cells()
+
+    def new_game(self):
+        """ Reset the pokemon locations for a new game. """
+        return self.get_pokemon_locations()
+
+    def get_pokemon_locations(self, seed=None):
+
+        """
+        Pokemons will be generated and given a random index within the game.
+
+        And update the value of self._pokemon_locations
+
+        Parameters:
+            seed (int): the seed of the board, a new seed is drawn when it is None
+
+        """
+        if seed is None:
+            seed = self._random.getrandbits(64)
+        self.set_pokemon_locations(place_pokemon(self._grid_size, self._num_pokemon, seed))
+        self._seed = seed
+
+    @property
+    def _pokemon_locations(self):
+        """
+        The locations of all the pokemons. The moves of the first click are only put into the tuple when it
+        is asked for, so that a move costs O(1).
+        """
+        if self._moved_to:
+            moved_to = self._moved_to
+            self._locations = tuple(moved_to.get(index, index) for index in self._locations)
+            self._moved_to = {}
+            self._moved_from = {}
+        return self._locations
+
+    @_pokemon_locations.setter
+    def _pokemon_locations(self, pokemon_locations):
+        self._locations = pokemon_locations
+        self._moved_to = {}
+        self._moved_from = {}
+
+    def get_seed(self):
+        """ Return the seed of the current pokemon locations, or None if they were set by hand or loaded """
+        return self._seed
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """
+        Move the pokemons to new locations and keep the adjacent pokemon counts up to date.
+
+        Only the cells around the old and the new locations are changed when the board size is the same.
+
+        Parameters:
+            pokemon_locations (tuple<int, ...>): the indexes of all the pokemons
+        """
+        if self._pokemon_cells is None:
+            if self._backend == SPARSE:
+                self._pokemon_cells = PokemonIndex()
+                self._pokemon_counts = NeighbourCounts(self._pokemon_cells, self._topology)
+            else:
+                self._pokemon_cells = bytearray(self._grid_size ** 2)
+                self._pokemon_counts = bytearray(self._grid_size ** 2)
+        else:
+            for index in self._pokemon_locations:
+                self._remove_pokemon(index)
+
+        for index in pokemon_locations:
+            self._add_pokemon(index)
+        self._pokemon_locations = tuple(pokemon_locations)
+        self._seed = None
+
+    def _add_pokemon(self, index):
+        """ Put a pokemon at index and count it in the cells around it (a sparse board counts them when asked). """
+        if self._pokemon_cells[index]:
+            return
+        self._pokemon_cells[index] = 1
+        if self._backend == SPARSE:
+            return
+        counts = self._pokemon_counts
+        for neighbour in self._topology.neighbours(index):
+            counts[neighbour] += 1
+
+    def _remove_pokemon(self, index):
+        """ Take the pokemon away from index and stop counting it in the cells around it. """
+        if not self._pokemon_cells[index]:
+            return
+        self._pokemon_cells[index] = 0
+        if self._backend == SPARSE:
+            return
+        counts = self._pokemon_counts
+        for neighbour in self._topology.neighbours(index):
+            counts[neighbour] -= 1
+
+    def get_locations(self):
+        """ Return the indexes of all the pokemons (get_pokemon_locations places new ones). """
+        return self._pokemon_locations
+
+    def get_pokemon_counts(self):
+        """
+        Return the array of how many pokemons are next to each cell, for code which reads many cells, or None
+        for a sparse board, which only counts them when asked. It must not be changed.
+        """
+        if self._backend == SPARSE:
+            return None
+        return self._pokemon_counts
+
+    def is_pokemon(self, index):
+        """ Return True if there is a pokemon at index. """
+        return self._pokemon_cells[index] == 1
+
+    def load(self, game_string, pokemon_locations, grid_size):
+        """
+        Replace the board with a saved game.
+
+        Parameters:
+            game_string (str): the saved game string
+            pokemon_locations (tuple<int, ...>): the saved pokemon locations
+            grid_size (int): the saved size of the game
+        """
+        self._set_grid_size(grid_size)
+        self._game_string = game_string
+        self.set_pokemon_locations(pokemon_locations)
+        self._num_pokemon = len(self._pokemon_locations)
+
+    def load_codes(self, cells, pokemon_locations, grid_size, count_numbers=False):
+        """
+        Replace the board with a saved game given as state codes, see load.
+
+        Parameters:
+            cells (bytes): the state code of every cell
+            pokemon_locations (tuple<int, ...>): the saved pokemon locations
+            grid_size (int): the saved size of the game
+            count_numbers (bool): the revealed cells are saved as 0 and get the number of pokemons next to them
+        """
+        self._set_grid_size(grid_size)
+        self.set_pokemon_locations(pokemon_locations)
+        self._num_pokemon = len(self._pokemon_locations)
+        if count_numbers:
+            revealed = cells.translate(REVEALED_MASK)
+            if self._backend == SPARSE:
+                numbers = bytes(self._pokemon_counts[index] if revealed[index] else 0 for index in range(len(cells)))
+            else:
+                numbers = self._pokemon_counts
+            # a whole-board select at C speed: the numbers of the revealed cells are or-ed into their 0 codes
+            selected = int.from_bytes(numbers, 'little') & int.from_bytes(revealed, 'little')
+            cells = (int.from_bytes(cells, 'little') | selected).to_bytes(len(cells), 'little')
+        self._set_cell_codes(cells)
+
+    def _set_grid_size(self, grid_size):
+        """ Change the size of the board before a saved game is put on it. """
+        if grid_size != self._grid_size:
+            self._grid_size = grid_size
+            self._use_topology()
+            self._pokemon_cells = None
+            self._pokemon_counts = None
+            self._visited = None
+
+    def get_grid_size(self):
+        """ Return the size of the game """
+        return self._grid_size
+
+    def get_topology(self):
+        """ Return the neighbours of the grid (Topology or GridTopology) """
+        return self._topology
+
+    def get_num_pokemon(self):
+        """ Calculate how many pokemons in this game """
+        return self._num_pokemon
+
+    def check_win(self):
+        """
+        Checking if the player has won the game.
+            Returns:
+                True: if win the game
+                False: if lose the game
+
+        """
+
+        return (self._code_counts[UNEXPOSED_CODE] == 0
+                and self._code_counts[FLAG_CODE] == len(self._locations))
+
+    def set_safe_first_click(self, mode):
+        """
+        Choose what the first reveal of a game is kept safe from, the pokemons in the way are moved to
+        random free cells when it is made.
+
+        Parameters:
+            mode (str): None for nothing, SAFE_CELL for the cell itself, SAFE_AREA for the cell and its
+                        neighbours
+        """
+        if mode not in SAFE_FIRST_CLICKS:
+            raise ValueError("Unknown first click mode: {0}".format(mode))
+        self._safe_first_click = mode
+
+    def get_safe_first_click(self):
+        """ Return the first click mode, None, SAFE_CELL or SAFE_AREA """
+        return self._safe_first_click
+
+    def protect_first_click(self, index):
+        """
+        Move the pokemons out of the way of a reveal at index, when it is the first reveal of the game and
+        the first click is kept safe. It has to be called before the reveal looks for a pokemon (reveal
+        calls it itself).
+
+        Only the counts around the moved pokemons are changed, and a free cell is found by drawing random
+        cells, so each move costs O(1) on average unless nearly every cell holds a pokemon. The clicked cell
+        is cleared first: when SAFE_AREA finds no free cell outside the area, its pokemon goes to a free
+        cell of the area, as SAFE_CELL would do, and the neighbours keep theirs.
+
+        Parameters:
+            index (int): the cell about to be revealed
+
+        Returns:
+            (list<tuple<int, int>>): (from, to) of every pokemon moved
+        """
+        if self._safe_first_click is None or self.get_num_revealed():
+            return []
+        keep_clear = [index]  # the clicked cell first, so that it is moved first
+        if self._safe_first_click == SAFE_AREA:
+            keep_clear.extend(self._topology.neighbours(index))
+        in_the_way = [cell for cell in keep_clear if self._pokemon_cells[cell]]
+        if not in_the_way:
+            return []
+
+        # the same board and first click always move the pokemons to the same cells
+        seed = self._seed if self._seed is not None else self._random.getrandbits(64)
+        generator = random.Random("first-click-{0}-{1}".format(seed, index))
+        cell_count = len(self._cells)
+        free_cells = None  # only listed when drawing keeps missing, on a nearly full board
+        moves = []
+        for cell in in_the_way:
+            target = None
+            for _ in range(64 if free_cells is None else 0):
+                candidate = generator.randrange(cell_count)
+                if not self._pokemon_cells[candidate] and candidate not in keep_clear:
+                    target = candidate
+                    break
+            if target is None:
+                if free_cells is None:
+                    free_cells = [other for other in range(cell_count)
+                                  if not self._pokemon_cells[other] and other not in keep_clear]
+                if free_cells:
+                    target = free_cells.pop(generator.randrange(len(free_cells)))
+                elif cell == index:  # no room outside the area, the clicked cell is still kept clear
+                    around = [other for other in keep_clear if other != index and not self._pokemon_cells[other]]
+                    if not around:
+                        break
+                    target = around[generator.randrange(len(around))]
+                else:
+                    break
+            self._move_pokemon(cell, target)
+            moves.append((cell, target))
+        return moves
+
+    def _move_pokemon(self, index, target):
+        """ Move the pokemon at index to the free cell target """
+        self._remove_pokemon(index)
+        self._add_pokemon(target)
+        placed = self._moved_from.pop(index, index)
+        self._moved_to[placed] = target
+        self._moved_from[target] = placed
+
+    def flag_cell(self, index):
+        """Toggle Flag on or off at selected index. If the selected index is already
+            revealed, the game would return with no changes.
+
+            Parameters:
+                index (int): The index in the game string where a flag is placed.
+            Returns
+                (str): The updated game string.
+        """
+
+        if self._cells[index] == FLAG_CODE:
+            self.set_cell(index, UNEXPOSED)
+
+        elif self._cells[index] == UNEXPOSED_CODE:
+            self.set_cell(index, FLAG)
+
+    def reveal_cells(self, index):
+        """
+        Reveals all neighbouring cells at index and repeats for all
+        cells that had a 0.
+
+        Does not reveal flagged cells or cells with Pokemon.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (str): The updated game string
+        """
+        self.reveal(index)
+        return self._game_string
+
+    def reveal(self, index):
+        """
+        Reveal the cell at index and, if it is a 0, flood out over the connected 0 cells and their borders.
+
+        Every cell is visited at most once and its number is read once, flagged cells are left as they are.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (list<tuple<int, int>>): (index, number) of every cell that changed, so the caller only has to
+                                     redraw these cells
+        """
+        cells = self._cells
+        if cells[index] == FLAG_CODE:
+            return []
+        self.protect_first_click(index)
+        counts = self._pokemon_counts
+        code_counts = self._code_counts
+
+        changes = []
+        number = counts[index]
+        if cells[index] != number:
+            code_counts[cells[index]] -= 1
+            code_counts[number] += 1
+            cells[index] = number
+            changes.append((index, number))
+            if number:
+                self._update_frontier(self._topology.neighbours(index) + [index])
+
+        if number == 0:
+            neighbours_of = self._topology.neighbours
+            visited = self._get_visited()
+            visited[index] = 1
+            met = [index]
+            queue = deque(met)
+            while queue:
+                node = queue.popleft()
+                for neighbour in neighbours_of(node):
+                    if visited[neighbour]:
+                        continue
+                    visited[neighbour] = 1
+                    met.append(neighbour)
+                    if cells[neighbour] == FLAG_CODE:
+                        continue
+                    number = counts[neighbour]
+                    if cells[neighbour] != number:
+                        code_counts[cells[neighbour]] -= 1
+                        code_counts[number] += 1
+                        cells[neighbour] = number
+                        changes.append((neighbour, number))
+                    if number == 0:
+                        queue.append(neighbour)
+            # the numbers met by the flood (new or old) are the only cells which can join or leave the
+            # frontier, with the old numbers just outside a new number
+            border = []
+            for node in met:
+                visited[node] = 0
+                if 0 < cells[node] < UNEXPOSED_CODE:
+                    border.append(node)
+            self._update_frontier(border)
+            for cell, number in changes:
+                if number:
+                    self._update_frontier(neighbours_of(cell))
+
+        if changes:
+            self._game_string_cache = None
+        return changes
+
+    def get_frontier(self):
+        """
+        Return the revealed number cells which are next to an unexposed (not flagged) cell, the cells a hint
+        or a solver has to look at. It is kept up to date by every change of the board.
+
+        Returns:
+            (FrontierView): a read only set of the indexes, it changes with the board
+        """
+        return FrontierView(self._frontier)
+
+    def _update_frontier(self, suspects):
+        """ Check again whether each of the suspect cells (the ones a change touched) is in the frontier. """
+        cells = self._cells
+        neighbours_of = self._topology.neighbours
+        frontier = self._frontier
+        for cell in suspects:
+            if 0 < cells[cell] < UNEXPOSED_CODE:
+                for neighbour in neighbours_of(cell):
+                    if cells[neighbour] == UNEXPOSED_CODE:
+                        frontier.add(cell)
+                        break
+                else:
+                    frontier.discard(cell)
+            else:
+                frontier.discard(cell)
+
+    def _get_visited(self):
+        """ Return the (all clear) visited marks of the board, made once for each board size. """
+        if self._visited is None:
+            if self._backend == SPARSE:
+                self._visited = ChunkedArray(self._grid_size)
+            else:
+                self._visited = bytearray(len(self._cells))
+        return self._visited
+
+    def replace_character_at_index(self, index, character):
+        """
+        A specified index in the game string at the specified index is replaced by
+        a new character.
+
+        Parameters:
+            index (int): The index in the game string where the character is replaced.
+            character (str): The new character that will be replacing the old character.
+
+        Returns:
+            (str): The updated game string.
+        """
+
+        self.set_cell(index, character)
+
+        return self._game_string
+
+    def index_in_direction(self, index, direction):
+        """
+       This function takes in the index to a cell in the game string
+    and returns a new index corresponding to an adjacent cell in the specified direction.
+
+        Return None for invalid directions.
+
+            Paramaters:
+        index (int): the index of the action in the game string
+        grid_size (int): size of game
+        direction (str): specific direction to find the neighbor of the selected
+
+            Returns:
+        neighbor index (int): return the specific direction cell's index
+        """
+
+        return self._topology.index_in_direction(index, direction)
+
+    def index_to_position(self, index):
+        """ Convert the game string index to the row, column coordinate.
+
+        Parameters:
+            index : the index of the cell in the game string
+
+        Returns:
+            tuple<int, int>: The row, column position of a cell
+        """
+        y = index // self._grid_size
+        x = index % self._grid_size
+
+        return x, y
+
+    def position_to_index(self, position):
+        """Convert the row, column coordinate in the grid to the game strings index.
+
+        Parameters:
+            position (tuple<int, int>): The row, column position of a cell.
+
+        Returns:
+            (int): The index of the cell in the game string.
+        """
+
+        x, y = position
+        return y * self._grid_size + x
+
+    def get_num_attempted_catches(self):
+        """
+        Calculate how many pokeballs are used currently
+
+        Returns:
+            (int): number of used pokeballs
+
+        """
+
+        return self._code_counts[FLAG_CODE]
+
+    def neighbour_directions(self, index):
+        """
+    #   This function returns a list of indexes that have a neighbouring cell.
+
+    #   Paramaters:
+        index (int): the index of the action in the game string.
+        grid_size (int): Size of game.
+
+    #   Returns:
+        a list which contains all the indexes of neighbouring cell
+
+        """
+
+        if index > self._grid_size ** 2:
+            return
+
+        return self._topology.neighbours(index)
+
+    def number_at_cell(self, index):
+        """Calculates what number should be displayed at that specific index in the game.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (int): Number to be displayed at the given index in the game string.
+    """
+        return self._pokemon_counts[index]
+
+    def big_fun_search(self, index):
+        """Searching adjacent cells to see if there are any Pokemon"s present.
+
+        Using some sick algorithms.
+
+        Find all cells which should be revealed when a cell is selected.
+
+        For cells which have a zero value (i.e. no neighbouring pokemons) all the cell"s
+        neighbours are revealed. If one of the neighbouring cells is also zero then
+        all of that cell"s neighbours are also revealed. This repeats until no
+        zero value neighbours exist.
+
+        For cells which have a non-zero value (i.e. cells with neighbour pokemons), only
+        the cell itself is revealed.
+
+        Parameters:
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (list<int>): List of cells to turn visible.
+
+        References:
+            a1_solution(1).py
+            https://learn.uq.edu.au/webapps/blackboard/content/listContent.jsp?course_id=_128547_1&content_id=_5017694_1
+        """
+
+        if self._cells[index] == FLAG_CODE:
+            return [index]
+
+        if self._pokemon_counts[index] != 0:
+            return [index]
+
+        visited = self._get_visited()
+        visited[index] = 1
+        met = [index]
+        visible = []
+        queue = deque(met)
+        while queue:
+            node = queue.popleft()
+            for neighbour in self._topology.neighbours(node):
+                if visited[neighbour]:
+                    continue
+
+                visited[neighbour] = 1
+                met.append(neighbour)
+                if self._cells[neighbour] != FLAG_CODE and self._pokemon_counts[neighbour] == 0:
+                    queue.append(neighbour)
+                visible.append(neighbour)
+
+        for node in met:
+            visited[node] = 0
+        return visible
@@ -0,0 +1,225 @@
+"""
+Monte Carlo win rates of Pokemon Games
+
+Plays many seeded games of each (grid_size, num_pokemon) on all the cores with a fixed policy and
+merges the results as the chunks come back. The totals only depend on the seeds, not on the number of
+workers or the order the chunks finish in.
+"""
+
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .board import BoardModel, DENSE
+from .simulation import WON, LOST, play_game, random_policy
+
+CHUNK_SIZE = 500  # games sent to a worker at a time
+CHUNKS_IN_FLIGHT = 2  # chunks sent ahead for each worker, the next one is sent as each comes back
+
+# the result of one chunk of games, played by the process worker
+ChunkResult = namedtuple('ChunkResult', 'grid_size num_pokemon games won lost moves seconds worker')
+
+
+def seeded_random_policy(seed):
+    """
+    The default policy of the runs, random_policy with a stream of its own for each board seed
+    (the board seed itself would make it click the cells the pokemons were placed in).
+    """
+    return random_policy(random.Random("policy-{0}".format(seed)))
+
+
+class WinRateStats(object):
+    """ The merged results of all the games played for one (grid_size, num_pokemon) """
+
+    def __init__(self, grid_size, num_pokemon):
+        self.grid_size = grid_size
+        self.num_pokemon = num_pokemon
+        self.games = 0
+        self.won = 0
+        self.lost = 0
+        self.moves = 0
+
+    def add(self, chunk):
+        """ Merge the result of a chunk of games """
+        self.games += chunk.games
+        self.won += chunk.won
+        self.lost += chunk.lost
+        self.moves += chunk.moves
+
+    def win_rate(self):
+        """ Return the share of the games which were won (0 - 1) """
+        if not self.games:
+            return 0.0
+        return self.won / self.games
+
+    def __repr__(self):
+        return "WinRateStats({0} x {0}, {1} pokemons: {2}/{3} won, {4:.1%})".format(
+            self.grid_size, self.num_pokemon, self.won, self.games, self.win_rate())
+
+
+class WorkerStats(object):
+    """ How many games one worker process played and how long it took """
+
+    def __init__(self, worker):
+        self.worker = worker
+        self.games = 0
+        self.seconds = 0.0
+
+    def add(self, chunk):
+        """ Count a chunk played by this worker """
+        self.games += chunk.games
+        self.seconds += chunk.seconds
+
+    def games_per_second(self):
+        """ Return the throughput of the worker """
+        if self.seconds <= 0:
+            return 0.0
+        return self.games / self.seconds
+
+
+class MonteCarloReport(object):
+    """ The win rates so far, and the throughput of each worker """
+
+    def __init__(self):
+        self.stats = {}  # (grid_size, num_pokemon) -> WinRateStats
+        self.workers = {}  # worker pid -> WorkerStats
+        self.chunks = 0
+        self.seconds = 0.0
+
+    def add(self, chunk):
+        """ Merge the result of a chunk of games """
+        key = (chunk.grid_size, chunk.num_pokemon)
+        if key not in self.stats:
+            self.stats[key] = WinRateStats(*key)
+        self.stats[key].add(chunk)
+        if chunk.worker not in self.workers:
+            self.workers[chunk.worker] = WorkerStats(chunk.worker)
+        self.workers[chunk.worker].add(chunk)
+        self.chunks += 1
+
+    def get_num_games(self):
+        """ Return how many games have been merged """
+        return sum(stats.games for stats in self.stats.values())
+
+    def games_per_second(self):
+        """ Return the throughput of the whole run """
+        if self.seconds <= 0:
+            return 0.0
+        return self.get_num_games() / self.seconds
+
+    def scaling(self):
+        """
+        Return the whole throughput divided by the mean worker throughput, which is close to the number
+        of workers when the run scales linearly.
+        """
+        rates = [worker.games_per_second() for worker in self.workers.values() if worker.games]
+        if not rates:
+            return 0.0
+        return self.games_per_second() / (sum(rates) / len(rates))
+
+
+def play_chunk(grid_size, num_pokemon, seeds, policy_factory=seeded_random_policy, backend=DENSE,
+               max_moves=None):
+    """
+    Play one game for every seed, this is what runs in the worker processes.
+
+    Parameters:
+        grid_size (int): the size of the games
+        num_pokemon (int): how many pokemons in the games
+        seeds (list<int>): the seed of each board, the policy of the game is made from the same seed
+        policy_factory (callable): policy_factory(seed) returns the policy of one game, it has to be a
+                                   module level function so that it can be sent to the workers
+        backend (str): the backend of the boards
+        max_moves (int): the longest game to play, None for no limit
+
+    Returns:
+        (ChunkResult): the merged result of the games
+    """
+    start = time.perf_counter()
+    won = lost = moves = 0
+    for seed in seeds:
+        model = BoardModel(grid_size, num_pokemon, seed=seed, backend=backend)
+        outcome, played = play_game(model, policy_factory(seed), max_moves=max_moves)
+        won += outcome == WON
+        lost += outcome == LOST
+        moves += played
+    return ChunkResult(grid_size, num_pokemon, len(seeds), won, lost, moves, time.perf_counter() - start,
+                       os.getpid())
+
+
+def _chunks(configs, seeds, chunk_size):
+    """ Split the seeds of every (grid_size, num_pokemon) into chunks """
+    seeds = list(seeds)
+    for grid_size, num_pokemon in configs:
+        for start in range(0, len(seeds), chunk_size):
+            yield grid_size, num_pokemon, seeds[start:start + chunk_size]
+
+
+def iter_win_rates(configs, seeds, policy_factory=seeded_random_policy, workers=None, chunk_size=CHUNK_SIZE,
+                   backend=DENSE, max_moves=None):
+    """
+    Play every seed for every (grid_size, num_pokemon) across the worker processes, and yield the
+    report each time a chunk of games comes back.
+
+    Parameters:
+        configs (iterable<tuple<int, int>>): the (grid_size, num_pokemon) to chart
+        seeds (iterable<int>): the seeds of the boards, the same for every config
+        policy_factory (callable): policy_factory(seed) returns the policy of one game
+        workers (int): the number of processes, None for one on each core, 1 to play in this process
+        chunk_size (int): how many games a worker plays at a time
+        backend (str): the backend of the boards
+        max_moves (int): the longest game to play, None for no limit
+
+    Yields:
+        (MonteCarloReport): the same report, with one more chunk merged each time
+    """
+    report = MonteCarloReport()
+    start = time.perf_counter()
+    chunks = _chunks(configs, seeds, chunk_size)
+
+    if workers == 1:
+        for grid_size, num_pokemon, chunk_seeds in chunks:
+            report.add(play_chunk(grid_size, num_pokemon, chunk_seeds, policy_factory, backend, max_moves))
+            report.seconds = time.perf_counter() - start
+            yield report
+        return
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit_next():
+        """ Send the next chunk to the pool, return False when there is none left """
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        pending.add(executor.submit(play_chunk, *chunk, policy_factory, backend, max_moves))
+        return True
+
+    pending = set()
+    try:
+        # only a few chunks wait in the pool, so that a caller who stops reading does not wait for the rest
+        while len(pending) < workers * CHUNKS_IN_FLIGHT and submit_next():
+            pass
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                submit_next()
+                report.add(future.result())
+                report.seconds = time.perf_counter() - start
+                yield report
+    finally:
+        # a caller who stopped early does not wait: the queued chunks are dropped, the running ones end alone
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_win_rates(configs, seeds, policy_factory=seeded_random_policy, workers=None, chunk_size=CHUNK_SIZE,
+                  backend=DENSE, max_moves=None):
+    """
+    Play every seed for every (grid_size, num_pokemon) and return the final report, see iter_win_rates.
+    """
+    report = MonteCarloReport()
+    for report in iter_win_rates(configs, seeds, policy_factory, workers, chunk_size, backend, max_moves):
+        pass
+    return report
@@ -0,0 +1,283 @@
+"""
+No-guess board generation
+
+Keeps drawing seeded boards and plays each one with the deterministic solver from a safe first click (the
+0 cell nearest the centre), and only accepts a board the solver wins without a guess. The seeds are checked
+in batches across a process pool until one passes or the time is up. The accepted seeds can be kept in a
+SeedCache (in memory or in a JSON file), so that the next game of the same size starts at once.
+generate_no_guess waits for its board; a NoGuessSearch keeps one pool and is polled, e.g. by a GUI timer.
+
+A board comes back as (seed, start): BoardModel(grid_size, num_pokemon, seed=seed) is the board, and the
+start cell has to be the first reveal.
+"""
+
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .atomic import write_atomic
+from .board import BoardModel, DENSE
+from .solver import Solver, SOLVED
+
+TIMEOUT = 5.0  # seconds to look for a board
+SEED_BATCH = 4  # seeds sent to a worker at a time
+
+
+def start_cell(model):
+    """
+    Return the 0 cell nearest the centre of the board, the first click the board is checked from,
+    or None when the board has no 0 cell.
+    """
+    grid_size = model.get_grid_size()
+    centre = grid_size // 2
+    for radius in range(grid_size):
+        low, high = centre - radius, centre + radius
+        for row in range(max(0, low), min(grid_size, high + 1)):
+            # the whole first and last rows of the ring, only the two ends of the others
+            columns = range(max(0, low), min(grid_size, high + 1)) if row in (low, high) else (low, high)
+            for column in columns:
+                if 0 <= column < grid_size:
+                    index = row * grid_size + column
+                    if not model.is_pokemon(index) and model.number_at_cell(index) == 0:
+                        return index
+    return None
+
+
+def check_seeds(grid_size, num_pokemon, seeds, deadline=None, backend=DENSE):
+    """
+    Play the board of every seed with the solver from its start cell, this is what runs in the workers.
+
+    Parameters:
+        grid_size (int): the size of the boards
+        num_pokemon (int): how many pokemons on the boards
+        seeds (list<int>): the seeds to check
+        deadline (float): time.time() after which the rest of the seeds are skipped, None for no limit
+        backend (str): the backend of the boards
+
+    Returns:
+        (tuple<list, int>): the accepted (seed, start) and how many seeds were checked
+    """
+    accepted = []
+    checked = 0
+    for seed in seeds:
+        if deadline is not None and time.time() > deadline:
+            break
+        checked += 1
+        model = BoardModel(grid_size, num_pokemon, seed=seed, backend=backend)
+        start = start_cell(model)
+        if start is not None and Solver(model).solve(start) == SOLVED:
+            accepted.append((seed, start))
+    return accepted, checked
+
+
+class SeedCache(object):
+    """ Accepted no-guess seeds for each (grid_size, num_pokemon), kept in a JSON file when given a path """
+
+    def __init__(self, path=None):
+        """
+        Parameters:
+            path (str): the file of the cache, None to keep it in memory only
+        """
+        self._path = path
+        self._seeds = {}  # "grid_size x num_pokemon" -> list of [seed, start]
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path) as cache_file:
+                    self._seeds = json.load(cache_file)
+            except ValueError:  # a broken file is started again
+                self._seeds = {}
+
+    @staticmethod
+    def _key(grid_size, num_pokemon):
+        return "{0}x{1}".format(grid_size, num_pokemon)
+
+    def count(self, grid_size, num_pokemon):
+        """ Return how many seeds are waiting for this size """
+        return len(self._seeds.get(self._key(grid_size, num_pokemon), ()))
+
+    def add(self, grid_size, num_pokemon, seed, start):
+        """ Keep an accepted (seed, start), every seed is only kept once """
+        seeds = self._seeds.setdefault(self._key(grid_size, num_pokemon), [])
+        if [seed, start] not in seeds:
+            seeds.append([seed, start])
+
+    def take(self, grid_size, num_pokemon):
+        """ Return and forget the oldest (seed, start) of this size, or None if there is none """
+        seeds = self._seeds.get(self._key(grid_size, num_pokemon))
+        if not seeds:
+            return None
+        seed, start = seeds.pop(0)
+        return seed, start
+
+    def save(self):
+        """ Write the cache to its file, a crash leaves the old one (see write_atomic) """
+        if self._path is None:
+            return
+        write_atomic(self._path, json.dumps(self._seeds).encode('utf-8'))
+
+
+def generate_no_guess(grid_size, num_pokemon, timeout=TIMEOUT, workers=None, cache=None, seed=None,
+                      batch=SEED_BATCH, backend=DENSE):
+    """
+    Find a board which can be won from its start cell without a guess.
+
+    Parameters:
+        grid_size (int): the size of the game
+        num_pokemon (int): how many pokemons
+        timeout (float): seconds to look before giving up
+        workers (int): the number of processes, None for one on each core, 1 to look in this process
+        cache (SeedCache): seeds to take before looking, the extra seeds found are added to it
+        seed (int): the seed of the stream of candidate seeds, None for a random stream
+        batch (int): how many seeds a worker checks at a time
+        backend (str): the backend of the boards
+
+    Returns:
+        (tuple<int, int>): (seed, start) of the board, or None if none was found in time
+    """
+    if cache is not None:
+        found = cache.take(grid_size, num_pokemon)
+        if found is not None:
+            return found
+
+    candidates = random.Random(seed)
+    deadline = time.time() + timeout
+
+    def next_batch():
+        return [candidates.getrandbits(64) for _ in range(batch)]
+
+    if workers == 1:
+        while time.time() < deadline:
+            accepted, _ = check_seeds(grid_size, num_pokemon, next_batch(), deadline, backend)
+            if accepted:
+                return _keep_extra(accepted, cache, grid_size, num_pokemon)
+        return None
+
+    found = []
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = {executor.submit(check_seeds, grid_size, num_pokemon, next_batch(), deadline, backend)
+                   for _ in range(workers)}
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED)
+            for future in done:
+                found.extend(future.result()[0])
+            if found or time.time() >= deadline:
+                break
+            for _ in done:
+                pending.add(executor.submit(check_seeds, grid_size, num_pokemon, next_batch(), deadline, backend))
+    finally:
+        # do not wait for the batches still running, they stop by themselves at the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not found:
+        return None
+    return _keep_extra(found, cache, grid_size, num_pokemon)
+
+
+def _keep_extra(accepted, cache, grid_size, num_pokemon):
+    """ Return the first accepted board and put the others in the cache """
+    if cache is not None:
+        for seed, start in accepted[1:]:
+            cache.add(grid_size, num_pokemon, seed, start)
+    return accepted[0]
+
+
+class NoGuessSearch(object):
+    """
+    Looks for no-guess boards on one process pool which lives as long as the search, without blocking the
+    caller: start a search, then poll it (e.g. from a GUI timer) until it finds a board or runs out of time.
+    Only one batch runs on each worker at a time. The batches of an earlier search end at its deadline and
+    their boards go to the cache, so a new search never starts a second pool.
+    """
+
+    def __init__(self, cache=None, workers=None, batch=SEED_BATCH, backend=DENSE, seed=None):
+        """
+        Parameters:
+            cache (SeedCache): seeds to take before looking, every board found is added to it
+            workers (int): the number of processes, None for one on each core
+            batch (int): how many seeds a worker checks at a time
+            backend (str): the backend of the boards
+            seed (int): the seed of the stream of candidate seeds, None for a random stream
+        """
+        self._cache = cache if cache is not None else SeedCache()
+        self._workers = workers or os.cpu_count() or 1
+        self._batch = batch
+        self._backend = backend
+        self._candidates = random.Random(seed)
+        self._executor = None  # made by the first search which misses the cache
+        self._pending = {}  # future -> the (grid_size, num_pokemon) of its batch
+        self._target = None  # the (grid_size, num_pokemon) looked for, None when no search is running
+        self._deadline = None
+
+    def start(self, grid_size, num_pokemon, timeout=TIMEOUT):
+        """
+        Start looking for a board, instead of the search running before.
+
+        Parameters:
+            grid_size (int): the size of the game
+            num_pokemon (int): how many pokemons
+            timeout (float): seconds to look before giving up
+
+        Returns:
+            (tuple<int, int>): (seed, start) at once when the cache has a board, otherwise None, and the
+                               board comes from poll
+        """
+        self._collect()
+        self._target = None
+        found = self._cache.take(grid_size, num_pokemon)
+        if found is not None:
+            return found
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        self._target = (grid_size, num_pokemon)
+        self._deadline = time.time() + timeout
+        self._fill()
+        return None
+
+    def poll(self):
+        """
+        Return (seed, start) once the search has found a board, None while it is looking or after it ran
+        out of time (see is_searching). It never waits.
+        """
+        if self._target is None:
+            return None
+        self._collect()
+        found = self._cache.take(*self._target)
+        if found is not None or time.time() >= self._deadline:
+            self._target = None
+            return found
+        self._fill()
+        return None
+
+    def is_searching(self):
+        """ Return True while a search is looking for its board """
+        return self._target is not None
+
+    def cancel(self):
+        """ Stop the search, the running batches end at its deadline """
+        self._target = None
+
+    def close(self):
+        """ Stop the pool, without waiting for the batches still running """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending = {}
+        self._target = None
+
+    def _fill(self):
+        """ Send a batch of the search to every worker which has none """
+        while len(self._pending) < self._workers:
+            seeds = [self._candidates.getrandbits(64) for _ in range(self._batch)]
+            future = self._executor.submit(check_seeds, *self._target, seeds, self._deadline, self._backend)
+            self._pending[future] = self._target
+
+    def _collect(self):
+        """ Put the boards of the finished batches in the cache """
+        for future in [future for future in self._pending if future.done()]:
+            grid_size, num_pokemon = self._pending.pop(future)
+            for seed, start in future.result()[0]:
+                self._cache.add(grid_size, num_pokemon, seed, start)
@@ -0,0 +1,421 @@
+"""
+Pokemon probabilities of the unexposed cells
+
+The frontier (the unexposed cells next to a revealed number) is split into components which share no
+number, and every component is counted on its own: for each k, how many ways k pokemons fit the numbers,
+and how many of those ways put a pokemon in each cell. A component is branched on one cell at a time and
+split again whenever the branch cuts it in two, and every count is cached under a canonical key (the
+numbers relabelled over the sorted cells), so a pattern which comes back anywhere on the board, or in the
+next query, is not counted again.
+
+The components are then weighted together by the number of ways the pokemons left over fit in the cells
+away from the frontier, C(rest, num_pokemon - flags - k).
+"""
+
+import math
+import time
+from collections import OrderedDict
+
+from .board import UNEXPOSED_CODE, FLAG_CODE, POKEMON_CODE
+
+CACHE_SIZE = 20000  # components whose counts are kept between queries
+NODE_BUDGET = 20000  # branches one frontier component may take before it is estimated instead
+COMPONENT_CELL_LIMIT = 200  # bigger frontier components are estimated without counting
+TIME_BUDGET = 0.2  # seconds of counting in one query, the components left over are estimated
+EXACT_DEGREE_LIMIT = 400  # the most pokemons the frontier can hold for the exact weighting
+ESTIMATE_ROUNDS = 4  # rounds of fitting the cells of a component which is estimated
+
+
+class _OverBudget(Exception):
+    """ A component took more branches than the node budget, or the query ran out of time """
+
+
+def _add(first, second):
+    """ Return the sum of two polynomials (lists of coefficients, [] is 0) """
+    if len(first) < len(second):
+        first, second = second, first
+    total = list(first)
+    for power, value in enumerate(second):
+        total[power] += value
+    return total
+
+
+def _multiply(first, second):
+    """ Return the product of two polynomials """
+    if not first or not second:
+        return []
+    product = [0] * (len(first) + len(second) - 1)
+    for i, a in enumerate(first):
+        if a:
+            for j, b in enumerate(second):
+                product[i + j] += a * b
+    return product
+
+
+def _shift(polynomial, power):
+    """ Return the polynomial multiplied by x ** power """
+    return [0] * power + polynomial if polynomial else []
+
+
+def _assign(constraints, assignment):
+    """
+    Put the assigned cells into the constraints and keep assigning the cells the constraints force.
+
+    Parameters:
+        constraints (list<tuple<tuple<int>, int>>): (cells, pokemons among them)
+        assignment (dict<int, int>): cell -> 1 for a pokemon, 0 for safe
+
+    Returns:
+        (tuple<dict, list>): the whole assignment and the constraints left, or None if one cannot be met
+    """
+    assignment = dict(assignment)
+    while True:
+        remaining = []
+        forced = {}
+        for cells, need in constraints:
+            free = []
+            for cell in cells:
+                value = assignment.get(cell)
+                if value is None:
+                    free.append(cell)
+                else:
+                    need -= value
+            if need < 0 or need > len(free):
+                return None
+            if not free:
+                continue
+            if need == 0 or need == len(free):
+                value = 1 if need else 0
+                for cell in free:
+                    if forced.setdefault(cell, value) != value:
+                        return None
+            else:
+                remaining.append((tuple(free), need))
+        if not forced:
+            return assignment, remaining
+        assignment.update(forced)
+        constraints = remaining
+
+
+def _components(constraints):
+    """ Split constraints into the groups which share cells """
+    parent = {}
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for cells, _ in constraints:
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        root = find(cells[0])
+        for cell in cells[1:]:
+            other = find(cell)
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for constraint in constraints:
+        groups.setdefault(find(constraint[0][0]), []).append(constraint)
+    return list(groups.values())
+
+
+class Probabilities(object):
+    """ The pokemon probability of every unexposed cell of a board """
+
+    def __init__(self, frontier, rest, rest_cells, exact):
+        """
+        Parameters:
+            frontier (dict<int, float>): the probability of every unexposed cell next to a number
+            rest (float): the probability of each of the other unexposed cells
+            rest_cells (int): how many other unexposed cells there are
+            exact (bool): False when some components were estimated (budget) or the weighting was approximated
+        """
+        self.frontier = frontier
+        self.rest = rest
+        self.rest_cells = rest_cells
+        self.exact = exact
+
+    def get(self, index):
+        """ Return the pokemon probability of an unexposed cell """
+        return self.frontier.get(index, self.rest)
+
+
+class ProbabilityEngine(object):
+    """
+    Works out the pokemon probability of the unexposed cells of a board. Keep one engine for a game, the
+    counts of the components it has seen are reused by the next queries.
+    """
+
+    def __init__(self, model, cache_size=CACHE_SIZE, node_budget=NODE_BUDGET):
+        """
+        Parameters:
+            model (BoardModel): the board, its flags are taken as pokemons
+            cache_size (int): how many component counts to keep
+            node_budget (int): how many branches one frontier component may take
+        """
+        self._model = model
+        self._cache = OrderedDict()  # canonical key -> (weights, weights of each cell)
+        self._cache_size = cache_size
+        self._node_budget = node_budget
+        self._nodes = 0
+        self._deadline = None
+
+    def _constraints(self):
+        """ Return the (unexposed cells, pokemons left) of every revealed number next to an unexposed cell """
+        model = self._model
+        codes = model.get_cell_codes()
+        neighbours = model.get_topology().neighbours
+        constraints = set()
+        for index in model.get_frontier():
+            number = codes[index]
+            unknown = []
+            for neighbour in neighbours(index):
+                code = codes[neighbour]
+                if code == UNEXPOSED_CODE:
+                    unknown.append(neighbour)
+                elif code == FLAG_CODE or code == POKEMON_CODE:
+                    number -= 1
+            if unknown:
+                constraints.add((tuple(unknown), number))
+        return list(constraints)
+
+    def _solve(self, constraints):
+        """
+        Count the ways the pokemons fit the constraints.
+
+        Returns:
+            (tuple<list, dict>): the weights (ways to place k pokemons, for each k) and the same weights for
+                                 the placements with a pokemon in each cell
+        """
+        weights, cell_weights = [1], {}
+        for group in _components(constraints):
+            cells = sorted({cell for group_cells, _ in group for cell in group_cells})
+            local = {cell: position for position, cell in enumerate(cells)}
+            key = tuple(sorted((tuple(sorted(local[cell] for cell in group_cells)), need)
+                               for group_cells, need in group))
+            counts = self._cache.get(key)
+            if counts is None:
+                counts = self._count(key, len(cells))
+                self._cache[key] = counts
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+
+            group_weights, group_cell_weights = counts
+            cell_weights = {cell: _multiply(cell_weight, group_weights) for cell, cell_weight in cell_weights.items()}
+            for position, cell_weight in enumerate(group_cell_weights):
+                cell_weights[cells[position]] = _multiply(weights, cell_weight)
+            weights = _multiply(weights, group_weights)
+        return weights, cell_weights
+
+    def _count(self, constraints, num_cells):
+        """ Count a connected component over the cells 0 .. num_cells - 1 by branching on one of its cells """
+        self._nodes += 1
+        if self._nodes > self._node_budget or (self._deadline is not None and time.perf_counter() > self._deadline):
+            raise _OverBudget()
+
+        # the cell in the most constraints, nearest the middle so that the branches tend to split
+        degrees = [0] * num_cells
+        for cells, _ in constraints:
+            for cell in cells:
+                degrees[cell] += 1
+        cell = max(range(num_cells), key=lambda cell: (degrees[cell], -abs(2 * cell - num_cells)))
+
+        weights, cell_weights = [], {}
+        for value in (0, 1):
+            branch = self._expand(constraints, {cell: value})
+            if branch is None:
+                continue
+            weights = _add(weights, branch[0])
+            for other, other_weights in branch[1].items():
+                cell_weights[other] = _add(cell_weights.get(other, []), other_weights)
+        return weights, tuple(cell_weights.get(other, []) for other in range(num_cells))
+
+    def _expand(self, constraints, assignment):
+        """ Count the constraints once the assignment is made, None if it breaks one """
+        assigned = _assign(constraints, assignment)
+        if assigned is None:
+            return None
+        assignment, remaining = assigned
+        pokemons = sum(assignment.values())
+        weights, cell_weights = self._solve(remaining)
+        cell_weights = {cell: _shift(cell_weight, pokemons) for cell, cell_weight in cell_weights.items()}
+        weights = _shift(weights, pokemons)
+        for cell, value in assignment.items():
+            cell_weights[cell] = weights if value else []
+        return weights, cell_weights
+
+    @staticmethod
+    def _estimate(group, density):
+        """
+        Stand in for a component which is too big to count: starting from the density of the board, the
+        cells of every number are scaled in turn until they add up to its pokemons. The component is taken
+        to hold the rounded sum of them.
+
+        Returns:
+            (tuple<int, list, dict>): the component in the form of _trim
+        """
+        probabilities = {cell: density for cells, _ in group for cell in cells}
+        for _ in range(ESTIMATE_ROUNDS):
+            for cells, need in group:
+                total = sum(probabilities[cell] for cell in cells)
+                if total > 0:
+                    for cell in cells:
+                        probabilities[cell] = min(1.0, probabilities[cell] * need / total)
+        pokemons = int(round(sum(probabilities.values())))
+        return pokemons, [1.0], {cell: [probability] for cell, probability in probabilities.items()}
+
+    @staticmethod
+    def _trim(weights, cell_weights):
+        """
+        Return the counts of a component as (low, weights, cell weights) where the lists start at low
+        pokemons, scaled to a largest weight of 1.
+        """
+        low = next(k for k, weight in enumerate(weights) if weight)
+        scale = max(weights)
+        return (low, [weight / scale for weight in weights[low:]],
+                {cell: [weight / scale for weight in cell_weight[low:]] for cell, cell_weight in cell_weights.items()})
+
+    def probabilities(self, time_budget=TIME_BUDGET):
+        """
+        Return the pokemon probability of every unexposed cell.
+
+        Parameters:
+            time_budget (float): seconds to spend counting, the components left after it are estimated;
+                                 None for no deadline, so that the result only depends on the board and
+                                 the node budget, not on the speed of the machine
+
+        Returns:
+            (Probabilities): the probabilities
+        """
+        self._deadline = None if time_budget is None else time.perf_counter() + time_budget
+        model = self._model
+        left = model.get_num_pokemon() - model.get_num_attempted_catches()
+        density = left / model.get_num_unexposed() if model.get_num_unexposed() else 0.0
+        exact = True
+
+        components = []
+        for group in _components(self._constraints()):
+            weights = None
+            if len({cell for cells, _ in group for cell in cells}) <= COMPONENT_CELL_LIMIT:
+                self._nodes = 0
+                try:
+                    weights, cell_weights = self._solve(group)
+                except _OverBudget:
+                    pass
+            if weights and any(weights):
+                components.append(self._trim(weights, cell_weights))
+            else:
+                # too big, over the budget, or the numbers contradict the flags
+                exact = False
+                components.append(self._estimate(group, density))
+
+        num_frontier = sum(len(cell_weights) for _, _, cell_weights in components)
+        rest_cells = model.get_num_unexposed() - num_frontier
+        degree = sum(low + len(weights) - 1 for low, weights, _ in components)
+        if degree <= EXACT_DEGREE_LIMIT:
+            frontier, rest = self._weigh_exact(components, left, rest_cells, degree)
+        else:
+            exact = False
+            frontier, rest = self._weigh_approximate(components, left, rest_cells)
+        return Probabilities(frontier, rest, rest_cells, exact)
+
+    @staticmethod
+    def _rest_weights(left, rest_cells, degree):
+        """ Return C(rest_cells, left - k) for k in 0 .. degree, scaled to a largest value of 1 """
+        logs = []
+        for pokemons in range(degree + 1):
+            outside = left - pokemons
+            if 0 <= outside <= rest_cells:
+                logs.append(math.lgamma(rest_cells + 1) - math.lgamma(outside + 1)
+                            - math.lgamma(rest_cells - outside + 1))
+            else:
+                logs.append(None)
+        top = max((value for value in logs if value is not None), default=0.0)
+        return [0.0 if value is None else math.exp(value - top) for value in logs]
+
+    def _weigh_exact(self, components, left, rest_cells, degree):
+        """ Weight every combination of the components by the ways the other pokemons fit in the rest """
+        rest_weights = self._rest_weights(left, rest_cells, degree)
+        components = [(_shift(weights, low), {cell: _shift(cell_weight, low)
+                                              for cell, cell_weight in cell_weights.items()})
+                      for low, weights, cell_weights in components]
+
+        # before[i] is the weights of the components before i; after[i](t) is the weight of the components
+        # from i on together with the rest, when t pokemons are already in the components before i
+        before = [[1.0]]
+        for weights, _ in components:
+            before.append(_multiply(before[-1], weights))
+        after = [None] * len(components) + [rest_weights]
+        for i in range(len(components) - 1, -1, -1):
+            weights = components[i][0]
+            following = after[i + 1]
+            after[i] = [sum(weight * following[t + k] for k, weight in enumerate(weights) if t + k <= degree)
+                        for t in range(degree + 1)]
+
+        total = sum(weight * rest_weights[t] for t, weight in enumerate(before[-1]))
+        frontier = {}
+        if total <= 0:
+            return frontier, left / rest_cells if rest_cells else 0.0
+        for i, (weights, cell_weights) in enumerate(components):
+            following = after[i + 1]
+            # the weight of everything else when this component holds k pokemons
+            others = [sum(weight * following[t + k] for t, weight in enumerate(before[i]) if t + k <= degree)
+                      for k in range(len(weights))]
+            for cell, cell_weight in cell_weights.items():
+                frontier[cell] = sum(weight * others[k] for k, weight in enumerate(cell_weight)) / total
+
+        rest = 0.0
+        if rest_cells:
+            rest = sum(weight * rest_weights[t] * (left - t) for t, weight in enumerate(before[-1])) / total / rest_cells
+        return frontier, rest
+
+    @staticmethod
+    def _weigh_approximate(components, left, rest_cells):
+        """
+        Weight each component on its own by the odds of a pokemon in the rest of the board, for a frontier too
+        big for the exact weighting. The odds are found by a few rounds of fitting the expected pokemons.
+        """
+        unexposed = rest_cells + sum(len(cell_weights) for _, _, cell_weights in components)
+        density = left / unexposed if unexposed else 0.0
+        frontier = {}
+        for _ in range(4):
+            density = min(max(density, 1e-9), 1 - 1e-9)
+            log_odds = math.log(density / (1 - density))
+            expected = 0.0
+            for low, weights, cell_weights in components:
+                # the weight of k pokemons times the odds to the k, relative to the lowest k
+                odds = [math.exp(min(k * log_odds, 700.0)) for k in range(len(weights))]
+                scaled = [weight * odd for weight, odd in zip(weights, odds)]
+                total = sum(scaled)
+                expected += low + sum(k * weight for k, weight in enumerate(scaled)) / total
+                for cell, cell_weight in cell_weights.items():
+                    frontier[cell] = sum(weight * odd for weight, odd in zip(cell_weight, odds)) / total
+            if not rest_cells:
+                break
+            density = (left - expected) / rest_cells
+        rest = min(max((left - sum(frontier.values())) / rest_cells, 0.0), 1.0) if rest_cells else 0.0
+        return frontier, rest
+
+    def safest_cell(self, time_budget=TIME_BUDGET):
+        """
+        Return the unexposed cell least likely to hold a pokemon, a frontier cell on a tie.
+
+        Parameters:
+            time_budget (float): seconds to spend counting, see probabilities
+
+        Returns:
+            (tuple<int, float>): the index of the cell and its probability, or None if nothing is unexposed
+        """
+        probabilities = self.probabilities(time_budget)
+        best = min(probabilities.frontier.items(), key=lambda item: (item[1], item[0]), default=None)
+        if probabilities.rest_cells and (best is None or probabilities.rest < best[1]):
+            codes = self._model.get_cell_codes()
+            for index in range(self._model.get_grid_size() ** 2):
+                if codes[index] == UNEXPOSED_CODE and index not in probabilities.frontier:
+                    return index, probabilities.rest
+        return best
@@ -0,0 +1,180 @@
+"""
+Binary save files of Pokemon Games
+
+A save file is made of:
+
+    header     HEADER: MAGIC, VERSION, the bits of a cell (2 or 4), the grid size, the number of pokemons
+               and the length of the pokemon list in bytes
+    cells      the state code of every cell in 4 bits, or in 2 bits when every revealed number matches the
+               pokemons around it (0 revealed, 1 unexposed, 2 flag, 3 pokemon), the numbers are then counted
+               again when the file is loaded
+    pokemons   the sorted pokemon indexes, as unsigned LEB128 varints of the gaps between them
+    checksum   the CRC-32 of everything before it
+
+The cells are packed and unpacked with whole-buffer operations (translate, slices and big integers), so a
+save or a load takes time proportional to the size of the file, and nothing read from a file is evaluated.
+A file is written with write_atomic, so a crash or a power loss leaves the old file as it was.
+"""
+
+import struct
+import zlib
+from collections import namedtuple
+
+from .atomic import write_atomic
+from .board import UNEXPOSED_CODE, FLAG_CODE, POKEMON_CODE, MIN_GRID_SIZE, MAX_GRID_SIZE, REVEALED_MASK
+
+MAGIC = b'PKMN'
+VERSION = 1
+HEADER = struct.Struct('<4sBBIII')  # magic, version, bits of a cell, grid size, pokemons, pokemon list bytes
+CHECKSUM = struct.Struct('<I')
+SAVE_EXTENSION = '.pkmn'
+
+# the 2 bit value of each state code and back, the revealed numbers are all 0
+TWO_BIT_VALUES = bytes(0 if code < UNEXPOSED_CODE else code - UNEXPOSED_CODE + 1 for code in range(256))
+TWO_BIT_CODES = bytes([0, UNEXPOSED_CODE, FLAG_CODE, POKEMON_CODE]).ljust(256, b'\0')
+VALID_CODES = bytes(range(POKEMON_CODE + 1))
+
+# a saved game: cells are the state codes, the revealed cells are 0 when count_numbers is set
+SavedBoard = namedtuple('SavedBoard', 'grid_size cells pokemon_locations count_numbers')
+
+
+def _shift_table(shift, mask=0xFF):
+    """ Return the translate table of (byte >> shift) & mask, a negative shift moves the bits up """
+    if shift < 0:
+        return bytes((byte << -shift) & mask for byte in range(256))
+    return bytes((byte >> shift) & mask for byte in range(256))
+
+
+def _pack(values, bits):
+    """ Pack values (each below 2 ** bits) into bytes, the first value in the highest bits """
+    per_byte = 8 // bits
+    values = bytes(values) + bytes(-len(values) % per_byte)
+    packed = 0
+    for slot in range(per_byte):
+        shift = bits * (per_byte - 1 - slot)
+        packed |= int.from_bytes(values[slot::per_byte].translate(_shift_table(-shift)), 'little')
+    return packed.to_bytes(len(values) // per_byte, 'little')
+
+
+def _unpack(data, bits, count):
+    """ Return the first count values packed in data by _pack """
+    per_byte = 8 // bits
+    values = bytearray(len(data) * per_byte)
+    for slot in range(per_byte):
+        values[slot::per_byte] = data.translate(_shift_table(bits * (per_byte - 1 - slot), (1 << bits) - 1))
+    return bytes(values[:count])
+
+
+def _encode_locations(locations):
+    """ Return the sorted pokemon indexes as varints of the gaps between them """
+    encoded = bytearray()
+    previous = -1
+    for index in sorted(locations):
+        gap = index - previous - 1
+        previous = index
+        while gap >= 0x80:
+            encoded.append(gap & 0x7F | 0x80)
+            gap >>= 7
+        encoded.append(gap)
+    return bytes(encoded)
+
+
+def _decode_locations(data, num_pokemon, cell_count):
+    """ Return the pokemon indexes encoded by _encode_locations, checking them against the header """
+    locations = []
+    index = -1
+    gap = shift = 0
+    for byte in data:
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        index += gap + 1
+        locations.append(index)
+        gap = shift = 0
+    if shift or len(locations) != num_pokemon or (locations and locations[-1] >= cell_count):
+        raise ValueError("The pokemon list of the save file is broken")
+    return tuple(locations)
+
+
+def _numbers_match(cells, counts):
+    """ Return True if every revealed number of the cells is the count of pokemons next to it """
+    revealed = int.from_bytes(cells.translate(REVEALED_MASK), 'little')
+    return int.from_bytes(cells, 'little') & revealed == int.from_bytes(counts, 'little') & revealed
+
+
+def dump_board(model):
+    """
+    Return the save file of a board.
+
+    Parameters:
+        model (BoardModel): the board
+
+    Returns:
+        (bytes): the content of the file
+    """
+    cells = bytes(model.get_cell_codes())
+    counts = model.get_pokemon_counts()
+    if counts is not None and _numbers_match(cells, counts):
+        bits, values = 2, cells.translate(TWO_BIT_VALUES)
+    else:
+        bits, values = 4, cells
+    locations = model.get_locations()
+    pokemons = _encode_locations(locations)
+    body = (HEADER.pack(MAGIC, VERSION, bits, model.get_grid_size(), len(locations), len(pokemons))
+            + _pack(values, bits) + pokemons)
+    return body + CHECKSUM.pack(zlib.crc32(body))
+
+
+def parse_board(data):
+    """
+    Read a save file, raise ValueError if it is not a save file, is of another version or is broken.
+
+    Parameters:
+        data (bytes): the content of the file
+
+    Returns:
+        (SavedBoard): the saved game
+    """
+    if len(data) < HEADER.size + CHECKSUM.size:
+        raise ValueError("Not a save file: it is too short")
+    magic, version, bits, grid_size, num_pokemon, pokemon_bytes = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a save file")
+    if version != VERSION:
+        raise ValueError("Unsupported save file version: {0}".format(version))
+    if bits not in (2, 4) or not MIN_GRID_SIZE <= grid_size <= MAX_GRID_SIZE:
+        raise ValueError("The header of the save file is broken")
+    cell_count = grid_size ** 2
+    cell_bytes = -(-cell_count * bits // 8)
+    body_size = HEADER.size + cell_bytes + pokemon_bytes
+    if len(data) != body_size + CHECKSUM.size:
+        raise ValueError("The save file has the wrong length")
+    if zlib.crc32(data[:body_size]) != CHECKSUM.unpack_from(data, body_size)[0]:
+        raise ValueError("The checksum of the save file does not match")
+
+    cells = _unpack(data[HEADER.size:HEADER.size + cell_bytes], bits, cell_count)
+    if bits == 2:
+        cells = cells.translate(TWO_BIT_CODES)
+    elif cells.translate(None, VALID_CODES):
+        raise ValueError("The save file has unknown cell states")
+    locations = _decode_locations(data[HEADER.size + cell_bytes:body_size], num_pokemon, cell_count)
+    return SavedBoard(grid_size, cells, locations, bits == 2)
+
+
+def save_board(model, path):
+    """ Write the save file of a board to path, the old file stays whole if the write fails (see write_atomic) """
+    write_atomic(path, dump_board(model))
+
+
+def load_board(model, path):
+    """
+    Replace a board with the game saved in path, raise ValueError if it is not a good save file.
+
+    Returns:
+        (SavedBoard): the saved game
+    """
+    with open(path, 'rb') as save_file:
+        saved = parse_board(save_file.read())
+    model.load_codes(saved.cells, saved.pokemon_locations, saved.grid_size, saved.count_numbers)
+    return saved
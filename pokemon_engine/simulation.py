@@ -0,0 +1,171 @@
+"""
+Batch simulation of Pokemon Games
+
+Plays games on BoardModel without any GUI, either from a script of moves or by asking a policy for
+every move, and reports the outcome, move count and time of every game and the throughput of the batch.
+"""
+
+import random
+import time
+from collections import namedtuple
+
+from .board import BoardModel, DENSE, UNEXPOSED_CODE, FLAG_CODE
+
+REVEAL = "reveal"  # a left click
+FLAG_MOVE = "flag"  # a right click
+
+WON = "won"
+LOST = "lost"
+UNFINISHED = "unfinished"  # the script or the policy ran out of moves
+OUTCOMES = (WON, LOST, UNFINISHED)
+
+# moves is a sequence of (REVEAL or FLAG_MOVE, index), None to let the policy play the game
+GameSpec = namedtuple('GameSpec', 'grid_size num_pokemon seed moves', defaults=(None,))
+GameResult = namedtuple('GameResult', 'grid_size num_pokemon seed outcome moves seconds')
+
+
+class BatchReport(object):
+    """ The results of a batch of games """
+
+    def __init__(self, results, seconds):
+        """
+        Parameters:
+            results (list<GameResult>): the result of every game, in the order they were given
+            seconds (float): the wall time of the whole batch
+        """
+        self.results = results
+        self.seconds = seconds
+
+    def count(self, outcome):
+        """ Return how many games ended with the outcome (WON, LOST or UNFINISHED) """
+        return sum(1 for result in self.results if result.outcome == outcome)
+
+    def get_num_moves(self):
+        """ Return how many moves were played in the whole batch """
+        return sum(result.moves for result in self.results)
+
+    def games_per_second(self):
+        """ Return the throughput of the batch """
+        if self.seconds <= 0:
+            return float('inf')
+        return len(self.results) / self.seconds
+
+    def __repr__(self):
+        return "BatchReport({0} games: {1} won, {2} lost, {3} unfinished, {4:.0f} games/s)".format(
+            len(self.results), self.count(WON), self.count(LOST), self.count(UNFINISHED), self.games_per_second())
+
+
+def apply_move(model, action, index):
+    """
+    Play one move on a board the way PokemonGame does for a click.
+
+    Revealing a pokemon loses the game (unless it is a first click the board keeps safe), a flag is only
+    placed while there are pokeballs left.
+
+    Parameters:
+        model (BoardModel): the board
+        action (str): REVEAL or FLAG_MOVE
+        index (int): the cell of the move
+
+    Returns:
+        (str): WON or LOST when the move ends the game, otherwise None
+    """
+    if action == REVEAL:
+        if model.get_cell_code(index) == FLAG_CODE:
+            return None
+        model.protect_first_click(index)
+        if model.is_pokemon(index):
+            return LOST
+        model.reveal(index)
+    elif action == FLAG_MOVE:
+        if model.get_num_attempted_catches() < model.get_num_pokemon() or model.get_cell_code(index) == FLAG_CODE:
+            model.flag_cell(index)
+    else:
+        raise ValueError("Unknown move: {0}".format(action))
+
+    if model.check_win():
+        return WON
+    return None
+
+
+def play_game(model, policy=None, moves=None, max_moves=None):
+    """
+    Play one game on a board.
+
+    Parameters:
+        model (BoardModel): a new board
+        policy (callable): policy(model) returns the next (action, index), or None to give up;
+                           it is used when there are no scripted moves
+        moves (iterable<tuple<str, int>>): the scripted moves
+        max_moves (int): stop the game after this many moves, None for no limit
+
+    Returns:
+        (tuple<str, int>): the outcome and the number of moves played
+    """
+    if moves is not None:
+        moves = iter(moves)
+    elif policy is None:
+        raise ValueError("A game needs either scripted moves or a policy")
+
+    played = 0
+    while max_moves is None or played < max_moves:
+        move = next(moves, None) if moves is not None else policy(model)
+        if move is None:
+            break
+        played += 1
+        outcome = apply_move(model, *move)
+        if outcome is not None:
+            return outcome, played
+    return UNFINISHED, played
+
+
+def simulate_games(games, policy=None, backend=DENSE, max_moves=None, safe_first_click=None):
+    """
+    Play a batch of games without any GUI.
+
+    Parameters:
+        games (iterable<GameSpec | tuple>): the games, (grid_size, num_pokemon, seed[, moves])
+        policy (callable): plays the games which have no scripted moves, see play_game
+        backend (str): the backend of the boards, DENSE or SPARSE
+        max_moves (int): the longest game to play, None for no limit
+        safe_first_click (str): the first click mode of the boards, None, SAFE_CELL or SAFE_AREA
+
+    Returns:
+        (BatchReport): the result of every game and the throughput
+    """
+    results = []
+    batch_start = time.perf_counter()
+    for game in games:
+        game = GameSpec(*game)
+        start = time.perf_counter()
+        model = BoardModel(game.grid_size, game.num_pokemon, seed=game.seed, backend=backend,
+                           safe_first_click=safe_first_click)
+        outcome, moves = play_game(model, policy, game.moves, max_moves)
+        results.append(GameResult(game.grid_size, game.num_pokemon, game.seed, outcome, moves,
+                                  time.perf_counter() - start))
+    return BatchReport(results, time.perf_counter() - batch_start)
+
+
+def random_policy(seed=None):
+    """
+    Return a policy which reveals a random unexposed cell every move, a baseline for throughput tests.
+
+    When only pokemons are left unexposed it flags them, so that the game can be won.
+
+    Parameters:
+        seed (int | random.Random | None): the seed of the choices
+    """
+    generator = seed if isinstance(seed, random.Random) else random.Random(seed)
+
+    def policy(model):
+        """ Reveal a random unexposed cell, or give up when there is none """
+        if not model.get_num_unexposed():
+            return None
+        only_pokemons = model.get_num_unexposed() + model.get_num_attempted_catches() == model.get_num_pokemon()
+        cell_count = model.get_grid_size() ** 2
+        while True:
+            index = generator.randrange(cell_count)
+            if model.get_cell_code(index) == UNEXPOSED_CODE:
+                return (FLAG_MOVE if only_pokemons else REVEAL), index
+
+    return policy
@@ -0,0 +1,302 @@
+"""
+Deterministic auto-solver of Pokemon Games
+
+Uses the numbers of the revealed cells to find cells which are certainly safe or certainly a pokemon:
+
+    single constraint: a number whose pokemons are all flagged makes its other unexposed neighbours safe,
+                       a number with as many unexposed neighbours as pokemons left makes them all pokemons
+    subset rule:       if the unexposed neighbours of number A are a subset of those of number B, the
+                       cells only next to B hold (B - A) of the pokemons
+
+Only the numbers whose neighbourhood changed since they were last looked at are examined again.
+"""
+
+import random
+from collections import deque
+
+from .board import UNEXPOSED_CODE, FLAG_CODE, POKEMON_CODE
+from .probability import ProbabilityEngine, TIME_BUDGET
+from .simulation import REVEAL, FLAG_MOVE, LOST, apply_move
+
+SOLVED = "solved"
+STUCK = "stuck"  # the board needs a guess
+
+
+class Solver(object):
+    """
+    Deduces the moves of a board. The solver hands out one move at a time (next_move) and assumes each
+    move is played on the board before it is asked for the next one, or it plays them itself (solve).
+    """
+
+    def __init__(self, model):
+        """
+        Parameters:
+            model (BoardModel): the board to solve, existing flags are taken as pokemons
+        """
+        self._model = model
+        self._grid_size = model.get_grid_size()
+        self._neighbours = model.get_topology().neighbours
+        self._code = model.get_cell_codes().__getitem__
+        self._pending = deque()  # numbers whose neighbourhood changed
+        self._queued = set()  # the cells in _pending
+        self._dirty = set()  # undecided numbers waiting for the subset rule
+        self._ready = deque()  # moves found but not handed out yet
+        self._last_move = None
+        self._moves = 0
+
+        for index in sorted(model.get_frontier()):
+            self._queued.add(index)
+            self._pending.append(index)
+
+    def get_num_moves(self):
+        """ Return how many moves the solver has handed out """
+        return self._moves
+
+    def _touch(self, index):
+        """ The cell at index changed, so the numbers around it (and the cell itself) need a new look """
+        code = self._code
+        queued = self._queued
+        for cell in self._neighbours(index) + [index]:
+            if cell not in queued and 0 < code(cell) < UNEXPOSED_CODE:
+                queued.add(cell)
+                self._pending.append(cell)
+
+    def sync(self, action, index):
+        """
+        Tell the solver about a move which has been played on the board, e.g. a guess.
+
+        Parameters:
+            action (str): REVEAL or FLAG_MOVE
+            index (int): the cell of the move
+        """
+        if action != REVEAL:
+            self._touch(index)
+            return
+
+        # walk over the cells the reveal opened, the same way the flood fill spread
+        code = self._code
+        seen = {index}
+        stack = [index]
+        while stack:
+            cell = stack.pop()
+            if code(cell) >= UNEXPOSED_CODE:
+                continue
+            self._touch(cell)
+            if code(cell) == 0:
+                for neighbour in self._neighbours(cell):
+                    if neighbour not in seen and code(neighbour) < UNEXPOSED_CODE:
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+
+    def _constraint(self, cell):
+        """
+        Return (unexposed neighbours, pokemons among them) of a revealed number, or None if the cell has no
+        unexposed neighbour.
+        """
+        number = self._code(cell)
+        if not 0 < number < UNEXPOSED_CODE:
+            return None
+        unknown = []
+        found = 0
+        for neighbour in self._neighbours(cell):
+            code = self._code(neighbour)
+            if code == UNEXPOSED_CODE:
+                unknown.append(neighbour)
+            elif code == FLAG_CODE or code == POKEMON_CODE:
+                found += 1
+        if not unknown:
+            return None
+        return unknown, number - found
+
+    def _deduce(self, cells, pokemons):
+        """ Add the moves for cells holding exactly this many pokemons, return True if it decided them """
+        if pokemons == 0:
+            self._ready.extend((REVEAL, cell) for cell in cells)
+        elif pokemons == len(cells):
+            self._ready.extend((FLAG_MOVE, cell) for cell in cells)
+        else:
+            return False
+        return True
+
+    def _examine(self, cell):
+        """ Apply the single constraint rule to a number, keep it for the subset rule if it is undecided """
+        constraint = self._constraint(cell)
+        if constraint is None:
+            self._dirty.discard(cell)
+            return
+        if self._deduce(*constraint):
+            self._dirty.discard(cell)
+        else:
+            self._dirty.add(cell)
+
+    def _window(self, cell):
+        """ Return the cells within 2 rows and columns of cell, the numbers which can share unexposed cells """
+        grid_size = self._grid_size
+        row, column = divmod(cell, grid_size)
+        columns = range(max(0, column - 2), min(grid_size, column + 3))
+        return [other_row * grid_size + other_column
+                for other_row in range(max(0, row - 2), min(grid_size, row + 3)) for other_column in columns]
+
+    def _subset_pass(self):
+        """ Apply the subset rule to the undecided numbers which changed, return True if it found moves """
+        dirty = sorted(self._dirty)
+        self._dirty = set()
+        constraints = {}
+
+        def constraint_of(cell):
+            if cell not in constraints:
+                constraint = self._constraint(cell)
+                constraints[cell] = None if constraint is None else (set(constraint[0]), constraint[1])
+            return constraints[cell]
+
+        found = False
+        for cell in dirty:
+            mine = constraint_of(cell)
+            if mine is None:
+                continue
+            for other in self._window(cell):
+                theirs = constraint_of(other) if other != cell else None
+                if theirs is None:
+                    continue
+                if theirs[0] < mine[0]:
+                    found = self._deduce(sorted(mine[0] - theirs[0]), mine[1] - theirs[1]) or found
+                elif mine[0] < theirs[0]:
+                    found = self._deduce(sorted(theirs[0] - mine[0]), theirs[1] - mine[1]) or found
+        return found
+
+    def _global_pass(self):
+        """
+        Use the number of pokemons left: when it is 0 every unexposed cell is safe, when it is the number of
+        unexposed cells they are all pokemons. Return True if it found moves.
+        """
+        model = self._model
+        unexposed = model.get_num_unexposed()
+        left = model.get_num_pokemon() - model.get_num_attempted_catches()
+        if not unexposed or (left != 0 and left != unexposed):
+            return False
+        cells = [index for index in range(self._grid_size ** 2) if self._code(index) == UNEXPOSED_CODE]
+        return self._deduce(cells, left)
+
+    def next_move(self):
+        """
+        Return the next certain move, or None if the board cannot be solved further without a guess.
+
+        Returns:
+            (tuple<str, int>): (REVEAL or FLAG_MOVE, index)
+        """
+        if self._last_move is not None:
+            self.sync(*self._last_move)
+            self._last_move = None
+
+        while True:
+            while self._ready:
+                move = self._ready.popleft()
+                if self._code(move[1]) == UNEXPOSED_CODE:
+                    self._last_move = move
+                    self._moves += 1
+                    return move
+            if self._pending:
+                cell = self._pending.popleft()
+                self._queued.discard(cell)
+                self._examine(cell)
+            elif self._dirty:
+                self._subset_pass()
+            elif not self._global_pass():
+                return None
+
+    def solve(self, start=None, max_moves=None):
+        """
+        Play the certain moves on the board until it is solved or needs a guess.
+
+        Parameters:
+            start (int): the first cell to reveal, e.g. a safe first click
+            max_moves (int): stop after this many moves, None for no limit
+
+        Returns:
+            (str): SOLVED, STUCK or LOST (only when the start or an existing flag was wrong)
+        """
+        model = self._model
+        if start is not None and self._code(start) == UNEXPOSED_CODE:
+            if self._play(REVEAL, start) == LOST:
+                return LOST
+
+        while max_moves is None or self._moves < max_moves:
+            move = self.next_move()
+            if move is None:
+                break
+            self._last_move = None  # _play tells the solver what changed
+            if self._play(*move) == LOST:
+                return LOST
+
+        return SOLVED if model.check_win() else STUCK
+
+    def _play(self, action, index):
+        """ Play a move on the board and look again at the cells it changed, return LOST if it hit a pokemon """
+        if action == REVEAL:
+            self._model.protect_first_click(index)
+            if self._model.is_pokemon(index):
+                apply_move(self._model, action, index)
+                return LOST
+            for cell, _ in self._model.reveal(index):
+                self._touch(cell)
+        else:
+            apply_move(self._model, action, index)
+            self._touch(index)
+        return None
+
+
+def solver_policy(seed=None, safest=False, time_budget=TIME_BUDGET):
+    """
+    Return a simulation policy which plays the solver's certain moves, and reveals a random unexposed cell
+    when the solver is stuck.
+
+    Parameters:
+        seed (int | random.Random | None): the seed of the guesses
+        safest (bool): guess the cell the probability engine finds least likely to be a pokemon instead
+        time_budget (float): seconds the probability engine may count for each guess, None for no deadline
+                             (the games then only depend on the seeds)
+    """
+    generator = seed if isinstance(seed, random.Random) else random.Random(seed)
+    state = {'model': None, 'solver': None, 'engine': None, 'guess': None}
+
+    def policy(model):
+        """ The next certain move, or a guess """
+        if state['model'] is not model:
+            state['model'] = model
+            state['solver'] = Solver(model)
+            state['engine'] = ProbabilityEngine(model) if safest else None
+            state['guess'] = None
+        solver = state['solver']
+        if state['guess'] is not None:
+            solver.sync(*state['guess'])
+            state['guess'] = None
+
+        move = solver.next_move()
+        if move is not None:
+            return move
+        if not model.get_num_unexposed():
+            return None
+        if state['engine'] is not None:
+            index = state['engine'].safest_cell(time_budget)[0]
+        else:
+            cell_count = model.get_grid_size() ** 2
+            index = generator.randrange(cell_count)
+            while model.get_cell_code(index) != UNEXPOSED_CODE:
+                index = generator.randrange(cell_count)
+        state['guess'] = (REVEAL, index)
+        return state['guess']
+
+    return policy
+
+
+def seeded_solver_policy(seed):
+    """ A policy_factory for the Monte Carlo runner, solver_policy with a guess stream of its own for each board """
+    return solver_policy(random.Random("solver-{0}".format(seed)))
+
+
+def safest_solver_policy(seed):
+    """
+    A policy_factory for the Monte Carlo runner, solver_policy guessing the safest cell. It has no
+    deadline, only the node budget, so that the totals of the runner still only depend on the seeds.
+    """
+    return solver_policy(seed, safest=True, time_budget=None)
@@ -0,0 +1,144 @@
+"""
+Sparse storage of the Pokemon game board
+
+Huge boards are mostly unexposed for the whole game, so the sparse board only keeps the tiles of
+the board which have been touched, and works the pokemon counts out when they are asked for.
+"""
+
+TILE_SIZE = 64  # a tile is TILE_SIZE x TILE_SIZE cells
+
+
+class ChunkedArray(object):
+    """
+    One byte for each cell of a square grid, like a bytearray, but only the tiles holding a value
+    other than the default are stored.
+    """
+
+    def __init__(self, grid_size, default=0):
+        """
+        Parameters:
+            grid_size (int): the size of the game
+            default (int): the value of every cell which has not been set
+        """
+        self._grid_size = grid_size
+        self._cell_count = grid_size ** 2
+        self._default = default
+        self._tiles_per_row = -(-grid_size // TILE_SIZE)
+        self._blank_tile = bytes([default]) * (TILE_SIZE * TILE_SIZE)
+        self._tiles = {}  # tile number -> bytearray of its cells, row by row
+
+    def _locate(self, index):
+        """ Return the (tile number, position in the tile) of a cell, raise IndexError if it is off the grid """
+        if not 0 <= index < self._cell_count:
+            raise IndexError("cell index out of range: {0}".format(index))
+        row, column = divmod(index, self._grid_size)
+        tile_row, row_in_tile = divmod(row, TILE_SIZE)
+        tile_column, column_in_tile = divmod(column, TILE_SIZE)
+        return tile_row * self._tiles_per_row + tile_column, row_in_tile * TILE_SIZE + column_in_tile
+
+    def __getitem__(self, index):
+        key, position = self._locate(index)
+        tile = self._tiles.get(key)
+        if tile is None:
+            return self._default
+        return tile[position]
+
+    def __setitem__(self, index, value):
+        key, position = self._locate(index)
+        tile = self._tiles.get(key)
+        if tile is None:
+            if value == self._default:
+                return
+            tile = self._tiles[key] = bytearray(self._blank_tile)
+        tile[position] = value
+
+    def __len__(self):
+        return self._cell_count
+
+    def __iter__(self):
+        """ Go through every cell of the grid, row by row """
+        return iter(bytes(self))
+
+    def __bytes__(self):
+        """ Return every cell of the grid, row by row """
+        grid_size = self._grid_size
+        cells = bytearray(self._blank_tile[:1]) * grid_size ** 2
+        for key, tile in self._tiles.items():
+            tile_row, tile_column = divmod(key, self._tiles_per_row)
+            first_column = tile_column * TILE_SIZE
+            width = min(TILE_SIZE, grid_size - first_column)
+            for row_in_tile in range(min(TILE_SIZE, grid_size - tile_row * TILE_SIZE)):
+                start = (tile_row * TILE_SIZE + row_in_tile) * grid_size + first_column
+                cells[start:start + width] = tile[row_in_tile * TILE_SIZE:row_in_tile * TILE_SIZE + width]
+        return bytes(cells)
+
+    def count(self, value):
+        """ Return how many cells of the grid hold value """
+        if value != self._default:
+            return sum(tile.count(value) for tile in self._tiles.values())
+        changed = sum(len(tile) - tile.count(value) for tile in self._tiles.values())
+        return self._grid_size ** 2 - changed
+
+    def get_tile_count(self):
+        """ Return how many tiles are stored """
+        return len(self._tiles)
+
+    @classmethod
+    def from_bytes(cls, grid_size, cells, default=0):
+        """
+        Build a chunked array out of the cells of a whole grid. The tiles are compared as row slices, but
+        every cell of the grid is still read, so it costs O(grid_size ** 2) however few tiles are stored.
+
+        Parameters:
+            grid_size (int): the size of the game
+            cells (bytes): a byte for every cell, row by row
+            default (int): the value which is not stored
+        """
+        array = cls(grid_size, default)
+        tiles_per_row = array._tiles_per_row
+        for tile_row in range(tiles_per_row):
+            rows = range(tile_row * TILE_SIZE, min(grid_size, (tile_row + 1) * TILE_SIZE))
+            for tile_column in range(tiles_per_row):
+                first_column = tile_column * TILE_SIZE
+                width = min(TILE_SIZE, grid_size - first_column)
+                blank = array._blank_tile[:width]
+                parts = [cells[row * grid_size + first_column:row * grid_size + first_column + width]
+                         for row in rows]
+                if all(part == blank for part in parts):
+                    continue
+                tile = array._tiles[tile_row * tiles_per_row + tile_column] = bytearray(array._blank_tile)
+                for row_in_tile, part in enumerate(parts):
+                    tile[row_in_tile * TILE_SIZE:row_in_tile * TILE_SIZE + width] = part
+        return array
+
+
+class PokemonIndex(set):
+    """
+    The set of pokemon locations, it can also be read like the pokemon mask of a dense board
+    (1 for a pokemon, 0 for none).
+    """
+
+    def __getitem__(self, index):
+        return 1 if index in self else 0
+
+    def __setitem__(self, index, value):
+        if value:
+            self.add(index)
+        else:
+            self.discard(index)
+
+
+class NeighbourCounts(object):
+    """ The number of pokemons next to each cell, worked out from the pokemon index when it is read """
+
+    def __init__(self, pokemon_index, topology):
+        """
+        Parameters:
+            pokemon_index (PokemonIndex): the pokemon locations
+            topology (GridTopology): the neighbours of the grid
+        """
+        self._pokemon_index = pokemon_index
+        self._neighbours = topology.neighbours
+
+    def __getitem__(self, index):
+        return len(self._pokemon_index.intersection(self._neighbours(index)))
@@ -0,0 +1,203 @@
+"""
+Neighbour tables of the Pokemon game board
+
+The neighbours of every cell only depend on the grid size, so they are worked out once for each
+grid size and shared by every board of that size.
+"""
+
+from array import array
+from itertools import accumulate
+
+UP = "up"
+DOWN = "down"
+LEFT = "left"
+RIGHT = "right"
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
+              f"{UP}-{LEFT}", f"{UP}-{RIGHT}",
+              f"{DOWN}-{LEFT}", f"{DOWN}-{RIGHT}")
+
+# the order of the neighbours of a cell, and how many rows and columns each one is away from it
+NEIGHBOUR_STEPS = ((f"{UP}-{LEFT}", -1, -1), (UP, -1, 0), (f"{UP}-{RIGHT}", -1, 1),
+                   (LEFT, 0, -1), (RIGHT, 0, 1),
+                   (f"{DOWN}-{LEFT}", 1, -1), (DOWN, 1, 0), (f"{DOWN}-{RIGHT}", 1, 1))
+DIRECTION_SLOTS = {direction: slot for slot, (direction, _, _) in enumerate(NEIGHBOUR_STEPS)}
+NO_NEIGHBOUR = -1
+TABLE_CELL_LIMIT = 250000  # bigger grids work their neighbours out instead of keeping tables (~70 bytes a cell)
+
+_topologies = {}  # grid size -> Topology, shared by all the boards
+
+
+class Topology(object):
+    """
+    The neighbour tables of one grid size.
+
+    _steps holds 8 slots for each cell (in NEIGHBOUR_STEPS order) with the index of the neighbour in that
+    direction or NO_NEIGHBOUR. _offsets and _neighbours are the same table without the empty slots, the
+    neighbours of cell i are _neighbours[_offsets[i]:_offsets[i + 1]].
+    """
+
+    def __init__(self, grid_size):
+        """
+        Build the neighbour tables
+
+        Parameters:
+            grid_size (int): the size of the game
+        """
+        self._grid_size = grid_size
+        cell_count = grid_size ** 2
+        slot_count = len(NEIGHBOUR_STEPS)
+
+        ramp = array('i', range(cell_count))  # neighbour indexes are copied out of this in slices
+        steps = array('i', [NO_NEIGHBOUR]) * (slot_count * cell_count)
+        for slot, (_, row_step, column_step) in enumerate(NEIGHBOUR_STEPS):
+            first_column = max(0, -column_step)
+            last_column = grid_size - max(0, column_step)
+            if first_column >= last_column:
+                continue
+            for row in range(max(0, -row_step), grid_size - max(0, row_step)):
+                first = row * grid_size + first_column
+                last = row * grid_size + last_column
+                step = row_step * grid_size + column_step
+                steps[first * slot_count + slot:last * slot_count:slot_count] = ramp[first + step:last + step]
+        self._steps = steps
+
+        # a cell has (rows around it) * (columns around it) - 1 neighbours
+        around = [min(i + 1, grid_size - 1) - max(i - 1, 0) + 1 for i in range(grid_size)]
+        counts = [rows * columns - 1 for rows in around for columns in around]
+        self._offsets = offsets = array('i', accumulate(counts, initial=0))
+
+        # the cells between the first and the last column of a row all have the same neighbours around them,
+        # so each of their neighbour slots is filled with one slice
+        neighbours = array('i', [NO_NEIGHBOUR]) * offsets[-1]
+        for row in range(grid_size):
+            row_steps = [(row_step * grid_size + column_step, column_step)
+                         for _, row_step, column_step in NEIGHBOUR_STEPS if 0 <= row + row_step < grid_size]
+            for column in {0, grid_size - 1}:
+                index = row * grid_size + column
+                position = offsets[index]
+                for step, column_step in row_steps:
+                    if 0 <= column + column_step < grid_size:
+                        neighbours[position] = index + step
+                        position += 1
+            if grid_size > 2:
+                first = row * grid_size + 1
+                start = offsets[first]
+                stop = offsets[first + grid_size - 2]
+                for slot, (step, _) in enumerate(row_steps):
+                    neighbours[start + slot:stop:len(row_steps)] = ramp[first + step:first + step + grid_size - 2]
+        self._neighbours = neighbours
+
+    def get_grid_size(self):
+        """ Return the grid size of the tables """
+        return self._grid_size
+
+    def index_in_direction(self, index, direction):
+        """
+        Return the index of the neighbour of a cell in a direction.
+
+        Parameters:
+            index (int): the index of the cell
+            direction (str): one of DIRECTIONS
+
+        Returns:
+            (int): the index of the neighbour, or None if there is no neighbour or no such direction
+        """
+        slot = DIRECTION_SLOTS.get(direction)
+        if slot is None:
+            return None
+        neighbour = self._steps[index * len(NEIGHBOUR_STEPS) + slot]
+        if neighbour == NO_NEIGHBOUR:
+            return None
+        return neighbour
+
+    def neighbours(self, index):
+        """
+        Return the indexes of all the neighbours of a cell.
+
+        Parameters:
+            index (int): the index of the cell
+
+        Returns:
+            (list<int>): the neighbours in NEIGHBOUR_STEPS order
+        """
+        return self._neighbours[self._offsets[index]:self._offsets[index + 1]].tolist()
+
+
+class GridTopology(object):
+    """
+    The neighbours of a grid which is too big for tables, they are worked out from the row and column of
+    the cell every time they are asked for.
+    """
+
+    def __init__(self, grid_size):
+        """
+        Parameters:
+            grid_size (int): the size of the game
+        """
+        self._grid_size = grid_size
+
+    def get_grid_size(self):
+        """ Return the grid size """
+        return self._grid_size
+
+    def index_in_direction(self, index, direction):
+        """
+        Return the index of the neighbour of a cell in a direction.
+
+        Parameters:
+            index (int): the index of the cell
+            direction (str): one of DIRECTIONS
+
+        Returns:
+            (int): the index of the neighbour, or None if there is no neighbour or no such direction
+        """
+        slot = DIRECTION_SLOTS.get(direction)
+        if slot is None:
+            return None
+        _, row_step, column_step = NEIGHBOUR_STEPS[slot]
+        row, column = divmod(index, self._grid_size)
+        if 0 <= row + row_step < self._grid_size and 0 <= column + column_step < self._grid_size:
+            return index + row_step * self._grid_size + column_step
+        return None
+
+    def neighbours(self, index):
+        """
+        Return the indexes of all the neighbours of a cell.
+
+        Parameters:
+            index (int): the index of the cell
+
+        Returns:
+            (list<int>): the neighbours in NEIGHBOUR_STEPS order
+        """
+        grid_size = self._grid_size
+        row, column = divmod(index, grid_size)
+        if 0 < row < grid_size - 1 and 0 < column < grid_size - 1:
+            above = index - grid_size
+            below = index + grid_size
+            return [above - 1, above, above + 1, index - 1, index + 1, below - 1, below, below + 1]
+
+        return [index + row_step * grid_size + column_step for _, row_step, column_step in NEIGHBOUR_STEPS
+                if 0 <= row + row_step < grid_size and 0 <= column + column_step < grid_size]
+
+
+def get_topology(grid_size):
+    """
+    Return the shared neighbour tables of a grid size, the tables are built the first time they are used.
+
+    Grids with more than TABLE_CELL_LIMIT cells get a GridTopology, which answers the same questions
+    without the tables.
+
+    Parameters:
+        grid_size (int): the size of the game
+
+    Returns:
+        (Topology | GridTopology): the neighbours of the grid
+    """
+    topology = _topologies.get(grid_size)
+    if topology is None:
+        if grid_size ** 2 > TABLE_CELL_LIMIT:
+            topology = _topologies[grid_size] = GridTopology(grid_size)
+        else:
+            topology = _topologies[grid_size] = Topology(grid_size)
+    return topology
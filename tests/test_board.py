@@ -0,0 +1,160 @@
+"""
+Tests of BoardModel (pokemon_engine.board)
+"""
+
+import random
+import unittest
+
+from pokemon_engine import BoardModel, DENSE, SPARSE, SAFE_CELL, SAFE_AREA, FLAG, UNEXPOSED, UNEXPOSED_CODE
+
+
+def full_frontier(model):
+    """ Return the frontier worked out from every cell: the numbers next to an unexposed cell """
+    codes = model.get_cell_codes()
+    neighbours = model.get_topology().neighbours
+    return {index for index in range(model.get_grid_size() ** 2)
+            if 0 < codes[index] < UNEXPOSED_CODE
+            and any(codes[neighbour] == UNEXPOSED_CODE for neighbour in neighbours(index))}
+
+
+def random_moves(model, picker, moves):
+    """ Play random reveals (off the pokemons), flags and unflags, yield after each of them """
+    cell_count = model.get_grid_size() ** 2
+    for _ in range(moves):
+        index = picker.randrange(cell_count)
+        if model.is_pokemon(index) or picker.random() < 0.2:
+            model.flag_cell(index)
+        else:
+            model.reveal(index)
+        yield index
+
+
+class FrontierTest(unittest.TestCase):
+
+    def check_board(self, grid_size, num_pokemon, backend, seed):
+        model = BoardModel(grid_size, num_pokemon, seed=seed, backend=backend)
+        for _ in random_moves(model, random.Random(seed), 60):
+            self.assertEqual(set(model.get_frontier()), full_frontier(model))
+
+    def test_dense(self):
+        for seed in range(20):
+            self.check_board(12, 25, DENSE, seed)
+
+    def test_sparse(self):
+        for seed in range(10):
+            self.check_board(70, 600, SPARSE, seed)
+
+    def test_set_cell_and_restart(self):
+        model = BoardModel(10, 15, seed=3)
+        picker = random.Random(3)
+        for _ in random_moves(model, picker, 20):
+            pass
+        for _ in range(30):
+            model.set_cell(picker.randrange(100), picker.choice("012" + UNEXPOSED + FLAG))
+            self.assertEqual(set(model.get_frontier()), full_frontier(model))
+        model.restart_game()
+        self.assertEqual(set(model.get_frontier()), set())
+
+    def test_load(self):
+        model = BoardModel(10, 15, seed=4)
+        for _ in random_moves(model, random.Random(4), 20):
+            pass
+        loaded = BoardModel(10, 15)
+        loaded.load(model._game_string, model.get_locations(), 10)
+        self.assertEqual(set(loaded.get_frontier()), full_frontier(model))
+
+
+class FirstClickTest(unittest.TestCase):
+
+    def check_click(self, grid_size, num_pokemon, mode, seed, index, backend=DENSE):
+        model = BoardModel(grid_size, num_pokemon, seed=seed, backend=backend, safe_first_click=mode)
+        neighbours = model.get_topology().neighbours
+        model.protect_first_click(index)
+        locations = model.get_locations()
+        self.assertFalse(model.is_pokemon(index))
+        self.assertEqual(len(set(locations)), num_pokemon)
+        self.assertEqual({cell for cell in range(grid_size ** 2) if model.is_pokemon(cell)}, set(locations))
+        recount = [sum(model.is_pokemon(neighbour) for neighbour in neighbours(cell))
+                   for cell in range(grid_size ** 2)]
+        if backend == DENSE:
+            self.assertEqual(list(model.get_pokemon_counts()), recount)
+        else:
+            self.assertEqual([model.number_at_cell(cell) for cell in range(grid_size ** 2)], recount)
+        return model
+
+    def test_safe_cell(self):
+        for seed in range(30):
+            self.check_click(8, 20, SAFE_CELL, seed, seed % 64)
+
+    def test_safe_area(self):
+        for seed in range(30):
+            model = self.check_click(8, 20, SAFE_AREA, seed, seed % 64)
+            index = seed % 64
+            self.assertFalse(any(model.is_pokemon(cell) for cell in model.get_topology().neighbours(index)))
+            self.assertEqual(model.reveal(index)[0], (index, 0))
+
+    def test_sparse(self):
+        for seed in range(10):
+            self.check_click(40, 300, SAFE_AREA, seed, seed * 97, backend=SPARSE)
+
+    def test_crowded_boards(self):
+        # no room outside the area: only the clicked cell is cleared
+        for grid_size, num_pokemon in ((2, 3), (3, 8), (3, 6)):
+            for mode in (SAFE_CELL, SAFE_AREA):
+                for seed in range(10):
+                    self.check_click(grid_size, num_pokemon, mode, seed, seed % grid_size ** 2)
+
+    def test_same_board_same_move(self):
+        boards = [self.check_click(10, 30, SAFE_AREA, 5, 44) for _ in range(2)]
+        self.assertEqual(sorted(boards[0].get_locations()), sorted(boards[1].get_locations()))
+
+    def test_later_reveals_are_left_alone(self):
+        model = BoardModel(8, 20, seed=1, safe_first_click=SAFE_CELL)
+        model.reveal(next(cell for cell in range(64) if not model.is_pokemon(cell)))
+        locations = sorted(model.get_locations())
+        self.assertEqual(model.protect_first_click(locations[0]), [])
+        self.assertEqual(sorted(model.get_locations()), locations)
+
+
+class SparseTest(unittest.TestCase):
+
+    def assertSameBoard(self, sparse, dense):
+        self.assertEqual(bytes(sparse.get_cell_codes()), bytes(dense.get_cell_codes()))
+        self.assertEqual(set(sparse.get_frontier()), set(dense.get_frontier()))
+        self.assertEqual(sparse.get_num_unexposed(), dense.get_num_unexposed())
+        self.assertEqual(sparse.get_num_attempted_catches(), dense.get_num_attempted_catches())
+        self.assertEqual(sparse.check_win(), dense.check_win())
+
+    def test_same_moves(self):
+        for seed in range(10):
+            sparse = BoardModel(30, 100, seed=seed, backend=SPARSE, safe_first_click=SAFE_AREA)
+            dense = BoardModel(30, 100, seed=seed, backend=DENSE, safe_first_click=SAFE_AREA)
+            picker = random.Random(seed)
+            for _ in range(80):
+                index = picker.randrange(900)
+                if sparse.is_pokemon(index) or picker.random() < 0.2:
+                    self.assertEqual(sparse.flag_cell(index), dense.flag_cell(index))
+                else:
+                    self.assertEqual(sorted(sparse.reveal(index)), sorted(dense.reveal(index)))
+                self.assertEqual(sorted(sparse.get_locations()), sorted(dense.get_locations()))
+                self.assertSameBoard(sparse, dense)
+
+    def test_numbers(self):
+        sparse = BoardModel(50, 400, seed=7, backend=SPARSE)
+        dense = BoardModel(50, 400, seed=7, backend=DENSE)
+        self.assertEqual([sparse.number_at_cell(index) for index in range(2500)],
+                         list(dense.get_pokemon_counts()))
+
+    def test_restart(self):
+        sparse = BoardModel(30, 100, seed=2, backend=SPARSE)
+        dense = BoardModel(30, 100, seed=2, backend=DENSE)
+        for model in (sparse, dense):
+            for _ in random_moves(model, random.Random(2), 40):
+                pass
+            model.restart_game()
+        self.assertSameBoard(sparse, dense)
+        self.assertEqual(sparse.get_game(), dense.get_game())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests of the probability engine (pokemon_engine.probability)
+"""
+
+import itertools
+import random
+import unittest
+
+from pokemon_engine import BoardModel, FLAG_CODE, UNEXPOSED_CODE
+from pokemon_engine.probability import ProbabilityEngine
+
+
+def brute_force(model):
+    """ Return the pokemon probability of every unexposed cell, from every placement the board allows """
+    codes = model.get_cell_codes()
+    neighbours = model.get_topology().neighbours
+    cell_count = model.get_grid_size() ** 2
+    unknown = [index for index in range(cell_count) if codes[index] == UNEXPOSED_CODE]
+    numbers = [index for index in range(cell_count) if codes[index] < UNEXPOSED_CODE]
+    left = model.get_num_pokemon() - model.get_num_attempted_catches()
+    hits = dict.fromkeys(unknown, 0)
+    placements = 0
+    for chosen in itertools.combinations(unknown, left):
+        pokemons = set(chosen)
+        if all(sum(neighbour in pokemons or codes[neighbour] == FLAG_CODE for neighbour in neighbours(index))
+               == codes[index] for index in numbers):
+            placements += 1
+            for index in chosen:
+                hits[index] += 1
+    return {index: hits[index] / placements for index in unknown}
+
+
+class ProbabilityEngineTest(unittest.TestCase):
+
+    def check_board(self, model):
+        expected = brute_force(model)
+        probabilities = ProbabilityEngine(model).probabilities(time_budget=None)
+        self.assertTrue(probabilities.exact)
+        self.assertEqual(set(probabilities.frontier) | set(expected), set(expected))
+        self.assertEqual(probabilities.rest_cells, len(expected) - len(probabilities.frontier))
+        for index, probability in expected.items():
+            self.assertAlmostEqual(probabilities.get(index), probability, places=9)
+            if index not in probabilities.frontier:
+                self.assertAlmostEqual(probabilities.rest, probability, places=9)
+
+    def test_brute_force(self):
+        checked = 0
+        for seed in range(60):
+            model = BoardModel(4, 3 + seed % 3, seed=seed)
+            picker = random.Random(seed)
+            safe = [index for index in range(16) if not model.is_pokemon(index)]
+            for index in picker.sample(safe, 1 + seed % 3):
+                model.reveal(index)
+            if seed % 2:
+                model.flag_cell(picker.choice(model.get_locations()))
+            if model.get_num_unexposed() and not model.check_win():
+                self.check_board(model)
+                checked += 1
+        self.assertGreater(checked, 40)
+
+    def test_untouched_board(self):
+        model = BoardModel(4, 5, seed=1)
+        probabilities = ProbabilityEngine(model).probabilities(time_budget=None)
+        self.assertEqual(probabilities.frontier, {})
+        self.assertAlmostEqual(probabilities.rest, 5 / 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
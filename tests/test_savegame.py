@@ -0,0 +1,159 @@
+"""
+Tests of the binary save files (pokemon_engine.savegame) and of write_atomic
+"""
+
+import os
+import random
+import shutil
+import stat
+import struct
+import tempfile
+import unittest
+import zlib
+
+from pokemon_engine import BoardModel, DENSE, SPARSE, POKEMON, UNEXPOSED_CODE
+from pokemon_engine.atomic import write_atomic
+from pokemon_engine.savegame import (HEADER, CHECKSUM, MAGIC, VERSION, dump_board, parse_board, save_board,
+                                     load_board)
+
+
+def played_board(grid_size, num_pokemon, backend=DENSE, seed=1, clicks=30):
+    """ Return a board with some cells revealed, a few flags and a pokemon shown """
+    model = BoardModel(grid_size, num_pokemon, seed=seed, backend=backend)
+    picker = random.Random("test-{0}".format(seed))
+    for _ in range(clicks):
+        index = picker.randrange(grid_size ** 2)
+        if model.is_pokemon(index):
+            model.flag_cell(index)
+        else:
+            model.reveal(index)
+    model.set_cell(model.get_locations()[0], POKEMON)
+    return model
+
+
+class SaveGameTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'game.pkmn')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertSameBoard(self, loaded, model):
+        self.assertEqual(loaded.get_grid_size(), model.get_grid_size())
+        self.assertEqual(bytes(loaded.get_cell_codes()), bytes(model.get_cell_codes()))
+        self.assertEqual(sorted(loaded.get_locations()), sorted(model.get_locations()))
+        self.assertEqual(loaded.get_num_pokemon(), model.get_num_pokemon())
+        self.assertEqual(loaded.get_num_unexposed(), model.get_num_unexposed())
+        self.assertEqual(set(loaded.get_frontier()), set(model.get_frontier()))
+
+    def round_trip(self, model, backend):
+        save_board(model, self.path)
+        loaded = BoardModel(4, 1, backend=backend)
+        saved = load_board(loaded, self.path)
+        self.assertSameBoard(loaded, model)
+        return saved
+
+    def test_dense_two_bits(self):
+        model = played_board(37, 150)
+        saved = self.round_trip(model, DENSE)
+        self.assertTrue(saved.count_numbers)
+        # a quarter of a byte a cell, and at most 2 bytes a pokemon
+        self.assertLessEqual(os.path.getsize(self.path), HEADER.size + -(-37 ** 2 // 4) + 2 * 150 + CHECKSUM.size)
+
+    def test_dense_four_bits(self):
+        model = played_board(20, 60)
+        revealed = next(index for index in range(400) if model.get_cell_code(index) < UNEXPOSED_CODE)
+        model.set_cell(revealed, str((model.get_cell_code(revealed) + 1) % 9))  # a number the counts disagree with
+        saved = self.round_trip(model, DENSE)
+        self.assertFalse(saved.count_numbers)
+
+    def test_sparse(self):
+        model = played_board(130, 2000, backend=SPARSE)
+        saved = self.round_trip(model, SPARSE)
+        self.assertFalse(saved.count_numbers)
+
+    def test_dense_to_sparse(self):
+        self.round_trip(played_board(70, 500), SPARSE)
+
+    def test_untouched_and_odd_sizes(self):
+        for grid_size in (2, 3, 5, 7):
+            self.round_trip(BoardModel(grid_size, 1, seed=grid_size), DENSE)
+
+    def test_loaded_board_plays_on(self):
+        model = played_board(16, 40)
+        save_board(model, self.path)
+        loaded = BoardModel(16, 40)
+        load_board(loaded, self.path)
+        index = next(index for index in range(256)
+                     if model.get_cell_code(index) == UNEXPOSED_CODE and not model.is_pokemon(index))
+        self.assertEqual(loaded.reveal(index), model.reveal(index))
+
+    def test_rejects_corrupted_files(self):
+        data = dump_board(played_board(25, 80))
+        for position in (0, 4, 6, HEADER.size + 3, len(data) - 6, len(data) - 1):
+            broken = bytearray(data)
+            broken[position] ^= 0x10
+            with self.assertRaises(ValueError):
+                parse_board(bytes(broken))
+
+    def test_rejects_truncated_and_padded_files(self):
+        data = dump_board(played_board(25, 80))
+        for length in (0, 3, HEADER.size, HEADER.size + 10, len(data) - 1):
+            with self.assertRaises(ValueError):
+                parse_board(data[:length])
+        with self.assertRaises(ValueError):
+            parse_board(data + b'\0')
+
+    def test_rejects_other_versions(self):
+        body = bytearray(dump_board(BoardModel(4, 2, seed=1))[:-CHECKSUM.size])
+        struct.pack_into('<B', body, 4, VERSION + 1)
+        with self.assertRaisesRegex(ValueError, "version"):
+            parse_board(bytes(body) + CHECKSUM.pack(zlib.crc32(body)))
+
+    def test_rejects_text_saves(self):
+        with self.assertRaises(ValueError):
+            parse_board("~~~~\n(1, 2)\n2\n".encode('utf-8'))
+
+    def test_header(self):
+        data = dump_board(BoardModel(10, 15, seed=2))
+        self.assertEqual(HEADER.unpack_from(data)[:5], (MAGIC, VERSION, 2, 10, 15))
+
+
+class WriteAtomicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'file.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_replaces_the_file(self):
+        write_atomic(self.path, b'old')
+        write_atomic(self.path, b'new')
+        with open(self.path, 'rb') as written:
+            self.assertEqual(written.read(), b'new')
+        self.assertEqual(os.listdir(self.directory), ['file.bin'])
+
+    def test_permissions(self):
+        write_atomic(self.path, b'new')
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o666 & ~umask)
+        os.chmod(self.path, 0o640)
+        write_atomic(self.path, b'again')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_failed_write_keeps_the_old_file(self):
+        write_atomic(self.path, b'old')
+        with self.assertRaises(TypeError):
+            write_atomic(self.path, "not bytes")
+        with open(self.path, 'rb') as written:
+            self.assertEqual(written.read(), b'old')
+        self.assertEqual(os.listdir(self.directory), ['file.bin'])
+
+
+if __name__ == '__main__':
+    unittest.main()
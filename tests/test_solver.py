@@ -0,0 +1,70 @@
+"""
+Tests of the auto-solver (pokemon_engine.solver)
+"""
+
+import random
+import unittest
+
+from pokemon_engine import BoardModel, DENSE, SPARSE, SAFE_AREA, FLAG_CODE, UNEXPOSED_CODE
+from pokemon_engine.simulation import REVEAL, FLAG_MOVE, LOST, apply_move
+from pokemon_engine.solver import Solver, SOLVED, STUCK
+
+
+class SolverTest(unittest.TestCase):
+
+    def play(self, grid_size, num_pokemon, seed, backend=DENSE):
+        """ Play the solver's moves, guessing a safe cell when it is stuck, and check every move """
+        model = BoardModel(grid_size, num_pokemon, seed=seed, backend=backend, safe_first_click=SAFE_AREA)
+        solver = Solver(model)
+        picker = random.Random(seed)
+        guess = picker.randrange(grid_size ** 2)
+        while True:
+            apply_move(model, REVEAL, guess)
+            solver.sync(REVEAL, guess)
+            move = solver.next_move()
+            while move is not None:
+                action, index = move
+                if action == FLAG_MOVE:
+                    self.assertTrue(model.is_pokemon(index), "flagged a cell without a pokemon")
+                else:
+                    self.assertEqual(action, REVEAL)
+                    self.assertFalse(model.is_pokemon(index), "revealed a pokemon")
+                apply_move(model, action, index)
+                move = solver.next_move()
+            if model.check_win():
+                break
+            safe = [index for index in range(grid_size ** 2)
+                    if model.get_cell_code(index) == UNEXPOSED_CODE and not model.is_pokemon(index)]
+            if not safe:
+                break
+            guess = picker.choice(safe)
+        flags = [index for index in range(grid_size ** 2) if model.get_cell_code(index) == FLAG_CODE]
+        self.assertTrue(all(model.is_pokemon(index) for index in flags))
+
+    def test_dense(self):
+        for seed in range(40):
+            self.play(16, 40, seed)
+
+    def test_crowded(self):
+        for seed in range(40):
+            self.play(8, 20, seed)
+
+    def test_sparse(self):
+        for seed in range(5):
+            self.play(40, 250, seed, backend=SPARSE)
+
+    def test_solve(self):
+        outcomes = set()
+        for seed in range(40):
+            model = BoardModel(16, 40, seed=seed, safe_first_click=SAFE_AREA)
+            outcome = Solver(model).solve(start=seed)
+            self.assertNotEqual(outcome, LOST)
+            outcomes.add(outcome)
+            for index in range(256):
+                if model.get_cell_code(index) == FLAG_CODE:
+                    self.assertTrue(model.is_pokemon(index))
+        self.assertEqual(outcomes, {SOLVED, STUCK})
+
+
+if __name__ == '__main__':
+    unittest.main()